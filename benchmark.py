@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+"""
+check.py 性能基准：按行数×列数网格生成模拟代谢组表达矩阵及对应分组文件（另含宽短、高窄等边界形状），
+计时 check_file_base、check_file_content（参数同 model.py）、check_com_line 及 model.py 完整检查阶段，
+结果写出为 JSON，便于不同版本间对比发现性能回退
+
+用法：
+    python3 benchmark.py -o bench_new.json
+    python3 benchmark.py -o bench_new.json --compare bench_old.json
+"""
+# ---- ---- ---- ---- ---- #
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import types
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault("CHECK_CALL_LOG", "off")  # 默认不打印函数调用记录，避免输出本身计入耗时
+import check as c
+
+try:
+    import checkdir  # noqa: F401  部署环境中check.py位于checkdir包内
+except ImportError:  # 源码目录中无checkdir包时，以本目录check.py充当checkdir.check，使model.py可导入并计时
+    checkdir = types.ModuleType("checkdir")
+    checkdir.check = c
+    sys.modules["checkdir"] = checkdir
+    sys.modules["checkdir.check"] = c
+
+try:
+    import model
+except ImportError as e:
+    model = None
+    _MODEL_ERROR = str(e)
+else:
+    _MODEL_ERROR = ""
+
+GRID_ROWS = (1000, 5000, 20000)
+GRID_COLS = (10, 50, 200)
+EDGE_SHAPES = {"wide_short": (20, 5000), "tall_narrow": (100000, 6)}
+
+
+def basic_options():
+    parser = argparse.ArgumentParser(usage="python3 %(prog)s",
+                                     description="Benchmark check.py on synthetic metabolomics matrices",
+                                     add_help=True)
+    parser.add_argument('-o', '--out', required=False, dest="out",
+                        help="JSON file of benchmark results. Optional, [default: %(default)s]",
+                        type=str, nargs='?', default="benchmark_result.json")
+    parser.add_argument('-w', '--workdir', required=False, dest="workdir",
+                        help="Directory for synthetic inputs, removed afterwards unless given. Optional",
+                        type=str, nargs='?', default=None)
+    parser.add_argument('-r', '--rows', required=False, dest="rows",
+                        help="Row numbers (metabolites) of the grid. Optional, [default: %(default)s]",
+                        type=int, nargs='+', default=list(GRID_ROWS))
+    parser.add_argument('-c', '--cols', required=False, dest="cols",
+                        help="Column numbers (samples) of the grid. Optional, [default: %(default)s]",
+                        type=int, nargs='+', default=list(GRID_COLS))
+    parser.add_argument('--no-edge', required=False, dest="edge", action="store_false",
+                        help="Skip wide-short and tall-narrow edge shapes")
+    parser.add_argument('-n', '--repeat', required=False, dest="repeat",
+                        help="Repeats of each timed step. Optional, [default: %(default)s]",
+                        type=int, nargs='?', default=3)
+    parser.add_argument('--seed', required=False, dest="seed",
+                        help="Random seed of synthetic data. Optional, [default: %(default)s]",
+                        type=int, nargs='?', default=0)
+    parser.add_argument('--label', required=False, dest="label",
+                        help="Version label written into results. Optional",
+                        type=str, nargs='?', default="")
+    parser.add_argument('--compare', required=False, dest="compare",
+                        help="Earlier JSON results to compare with. Optional",
+                        type=str, nargs='?', default=None)
+    parser.add_argument('--threshold', required=False, dest="threshold",
+                        help="Slowdown ratio reported as regression. Optional, [default: %(default)s]",
+                        type=float, nargs='?', default=1.2)
+    parser.add_argument('--min-time', required=False, dest="min_time",
+                        help="Steps faster than this (seconds) in both runs are not reported as regression. "
+                             "Optional, [default: %(default)s]",
+                        type=float, nargs='?', default=0.01)
+    return parser
+
+
+def make_matrix(path, rows, cols, rng):
+    """
+    生成模拟表达矩阵：首行Index及样品名，首列代谢物名，其余为正浮点数，约1%为表达量一致（方差为0）的代谢物
+    :param path: 字符串，输出文件
+    :param rows: 整数，代谢物数（不含标题行）
+    :param cols: 整数，总列数（含Index列）
+    :param rng: numpy随机数生成器
+    :return: 样品名列表
+    """
+    samples = [f"S{j}" for j in range(1, cols)]
+    with open(path, "w", encoding="UTF-8") as fileOU:
+        fileOU.write("\t".join(["Index"] + samples) + "\n")
+        block = 5000
+        for start in range(0, rows, block):
+            data = rng.lognormal(mean=8, sigma=2, size=(min(block, rows - start), cols - 1))
+            const = rng.random(len(data)) < 0.01
+            data[const] = data[const, :1]
+            lines = [f"MW{start + i:07d}\t" + "\t".join(f"{x:.6g}" for x in row) for i, row in enumerate(data)]
+            fileOU.write("\n".join(lines) + "\n")
+    return samples
+
+
+def make_group(path, samples, n_group=3):
+    """
+    生成与表达矩阵样品对应的分组文件（Index、Group两列）
+    :param path: 字符串，输出文件
+    :param samples: 列表，样品名
+    :param n_group: 整数，分组数
+    :return: 无返回
+    """
+    with open(path, "w", encoding="UTF-8") as fileOU:
+        fileOU.write("Index\tGroup\n")
+        for i, sample in enumerate(samples):
+            fileOU.write(f"{sample}\tG{i % n_group + 1}\n")
+
+
+def time_step(func, repeat=3):
+    """
+    重复计时同一步骤，每次前清空检查模块的文件缓存，避免缓存命中掩盖首次读入耗时
+    :param func: 无参可调用对象
+    :param repeat: 整数，重复次数
+    :return: (每次耗时秒数列表, 最后一次返回值)
+    """
+    seconds = []
+    result = None
+    for _ in range(max(1, repeat)):
+        c.clear_file_cache()
+        start = time.perf_counter()
+        result = func()
+        seconds.append(time.perf_counter() - start)
+    return seconds, result
+
+
+def run_case(name, rows, cols, workdir, rng, repeat=3):
+    """
+    生成一组输入并计时各检查步骤
+    :param name: 字符串，用例名
+    :param rows: 整数，代谢物数
+    :param cols: 整数，总列数（含Index列）
+    :param workdir: 字符串，输入输出目录
+    :param rng: numpy随机数生成器
+    :param repeat: 整数，每步重复次数
+    :return: 结果字典列表，每步一条
+    """
+    case_dir = os.path.join(workdir, name)
+    data_dir = os.path.join(case_dir, "tmp_data")
+    os.makedirs(data_dir, exist_ok=True)
+    infile = os.path.join(case_dir, "data.txt")
+    groupfile = os.path.join(case_dir, "group.txt")
+    newinfile = os.path.join(data_dir, "data.txt")
+    newgroupfile = os.path.join(data_dir, "group.txt")
+    samples = make_matrix(infile, rows, cols, rng)
+    make_group(groupfile, samples)
+    steps = [
+        ("check_file_base", lambda: c.check_file_base(in_file=infile, out_file=newinfile, max_size="4096M")),
+        ("check_file_content", lambda: c.check_file_content(
+            in_file=newinfile, out_dir=data_dir, col_min_num_exp=5, ck_col_base=True, ck_col_dup=False,
+            ck_col_list=-1, ck_col_type=True, ck_col_type_list=-1, exp_type="float", rm_first=True,
+            add_info='输入文件：')),
+        ("check_file_base_group", lambda: c.check_file_base(in_file=groupfile, out_file=newgroupfile)),
+        ("check_com_line", lambda: c.check_com_line(in_file1=newinfile, in_file2=newgroupfile, ck_1_row=True,
+                                                    ck_2_col=True, rm_first=True)),
+    ]
+    if model is not None:
+        job_dir = os.path.join(case_dir, "job")
+        steps.append(("model_check_job", lambda: model.check_job(infile, groupfile, outdir=job_dir)[0]))
+    results = []
+    for step, func in steps:
+        seconds, result = time_step(func, repeat=repeat)
+        results.append(dict(case=name, rows=rows, cols=cols, size=os.path.getsize(infile), step=step,
+                             seconds=seconds, min=min(seconds), median=statistics.median(seconds),
+                             errors=result if result else []))
+        print(f"{name:>16} {step:<22} min {min(seconds):9.4f}s  median {statistics.median(seconds):9.4f}s"
+              + ("  (返回报错信息)" if result else ""))
+    if model is None:
+        results.append(dict(case=name, rows=rows, cols=cols, size=os.path.getsize(infile), step="model_check_job",
+                            skipped=f"model.py无法导入：{_MODEL_ERROR}"))
+    shutil.rmtree(case_dir, True)
+    return results
+
+
+def compare(old_file, new_results, threshold=1.2, min_time=0.01):
+    """
+    与既往结果按（用例，步骤）比较最短耗时
+    :param old_file: 字符串，既往JSON结果
+    :param new_results: 列表，本次结果
+    :param threshold: 浮点数，耗时比值达到该值视为性能回退
+    :param min_time: 浮点数，前后耗时均低于该秒数时计时噪声较大，不视为性能回退
+    :return: 性能回退条目列表
+    """
+    with open(old_file, encoding="UTF-8") as fileIN:
+        old = {(x["case"], x["step"]): x for x in json.load(fileIN)["results"] if "min" in x}
+    regressions = []
+    for new in new_results:
+        base = old.get((new["case"], new["step"]))
+        if base is None or "min" not in new:
+            continue
+        ratio = new["min"] / base["min"] if base["min"] > 0 else float("inf")
+        flag = "  <-- 回退" if ratio >= threshold and max(new["min"], base["min"]) >= min_time else ""
+        print(f"{new['case']:>16} {new['step']:<22} {base['min']:9.4f}s -> {new['min']:9.4f}s  x{ratio:.2f}{flag}")
+        if flag:
+            regressions.append(dict(case=new["case"], step=new["step"], old=base["min"], new=new["min"],
+                                    ratio=ratio))
+    return regressions
+
+
+def main(in_parser):
+    args, unparsed = in_parser.parse_known_args()
+    rng = np.random.default_rng(args.seed)
+    shapes = [(f"{r}x{col}", r, col) for r in args.rows for col in args.cols]
+    if args.edge:
+        shapes.extend((name, r, col) for name, (r, col) in EDGE_SHAPES.items())
+    workdir = args.workdir or tempfile.mkdtemp(prefix="check_bench.")
+    if model is None:
+        print(f"model.py无法导入，跳过完整检查阶段计时：{_MODEL_ERROR}")
+    results = []
+    try:
+        for name, rows, cols in shapes:
+            results.extend(run_case(name, rows, cols, workdir, rng, repeat=args.repeat))
+    finally:
+        if args.workdir is None:
+            shutil.rmtree(workdir, True)
+    report = dict(meta=dict(label=args.label, time=time.strftime('%Y-%m-%d %H:%M:%S', time.localtime()),
+                            python=platform.python_version(), numpy=np.__version__, pandas=pd.__version__,
+                            platform=platform.platform(), cpu_count=os.cpu_count(), repeat=args.repeat,
+                            seed=args.seed, argv=sys.argv[1:]),
+                  results=results)
+    regressions = []
+    if args.compare:
+        regressions = compare(args.compare, results, threshold=args.threshold, min_time=args.min_time)
+        report["regressions"] = regressions
+    with open(args.out, "w", encoding="UTF-8") as fileOU:
+        json.dump(report, fileOU, ensure_ascii=False, indent=1)
+    print(f"结果已写出：{os.path.abspath(args.out)}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(basic_options())
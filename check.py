@@ -26,37 +26,301 @@ Maintenance records:
 * 修复 check_file_content函数 列表长度范围检查参数传递不准确问题
 * 修复 list_num_ban函数 禁用值为单个数值时报错问题
 * 修复 check_file_content函数 检查数值禁用值及数值范围检查时错误传参问题
+2026.10.18
+* 新增 check_file_content函数 one_pass参数，一次读入文件后在内存表中完成各项行/列检查
+* 修复 get_row2list函数 rm_blank为False时返回空列表问题
+* 新增 文件行偏移索引（_LineIndex），get_row_line及get_row2list按行号直接定位读取
+* 新增 file_line_sep函数，一次流式读入完成逐行分隔符规范检查，替代check_file_content中逐行读取检查
+* 调整 line_sep函数 正则仅编译一次
+* 调整 get_row_num及get_col_num函数 进程内分块统计替代awk子进程，结果按文件路径、修改时间及大小缓存
+* 调整 pre_check_file_content函数 按列向量化去除元素前后空白，替代逐个元素读写
+* 调整 pre_check_file_content函数 一次流式读写完成删空白行及去元素前后空白，原子替换输出文件，不再调用mkdir/cp/sed及pandas
+* 调整 file_line_dup函数 以行摘要集合判重，新增mem_lines参数，超出后改用外部排序查重
+* 新增 文件内容表LRU缓存（按路径、修改时间、大小、分隔符及去空白选项，限制总内存），get_row2list/get_col2list/check_file_content共用
+* 新增 clear_file_cache函数，清空文件相关缓存
+* 新增 check_file_content函数 n_jobs参数，行/列基础检查及类型检查可分批交由进程池并行，结果按行/列号顺序合并
+* 调整 list_type函数 不再使用eval，按类型名映射转换函数；转换失败时向量化定位并报告全部非期望类型元素及其位置
+* 新增 num_range_mask/num_ban_mask函数，对数值数组（含二维块）一次计算越界/禁用掩码；list_num_range/list_num_ban及check_file_content按掩码生成报错信息
+* 修复 list_num_ban函数 禁用值为单个数值时报错信息生成失败问题
+* 新增 get_const_mask函数，一次按min==max向量化识别数值块中的全部常量行/列（方差为0）
+* 修复 check_file_content函数 行/列标准化检查永不执行及行列共用检查列表的问题，改为对已通过数值类型检查的目标行/列按块识别常量
+* 新增 check_file_content函数 chunk_size参数，分块流式检查：行检查逐块进行，列检查按列累计结果，内存占用不随文件整体增长
+* 调整 _get_encoding函数 先识别BOM，再分块严格按ASCII/UTF-8解码，均不符合时才以chardet增量检测至足够置信
+* 调整 file_convert函数 二进制分块增量解码/编码，写入临时文件后原子替换，不再调用cp/rm；已为UTF-8且原地转换时直接跳过；修复解码失败时静默截断输出问题
+* 调整 check_file_base函数 只获取一次文件信息、只读入一次文件，编码检测及转码共用；无需转码时直接复制（可选硬链接）输出文件；文件不存在时不再检查编码及转码
+* 调整 file_convert函数 新增data及link参数，可复用已读入内容；UTF-8到UTF-8转换直接复制或硬链接
+* 优化 str_format/list_format 正则按表达式缓存编译，list_format 整列一次匹配，不再逐元素调用str_format
+* 调整 list_dup/list_ban/list_na函数 基于哈希一次判重及求交（数组/Series使用duplicated/isin），元素已为字符串时不再逐个转换；list_dup新增strip参数；禁用及缺失元素集合在check_file_content中只生成一次
+* 调整 文件内容表（_FileTable） 全部元素存放于一块连续字节缓冲并以numpy数组记录元素偏移，不再为每个元素常驻字符串对象，取行/列时才解码生成元素列表
+* 新增 start_profile/stop_profile/write_profile函数及profile_step，可选记录各检查步骤（check_file_base各项、pre_check_file_content、check_file_content各阶段等）耗时及tracemalloc内存峰值并写出JSON
+* 新增 file_var_filter函数，按行分块流式删除方差为0的行（float64/float32），可多进程并行，返回保留行数
+* 新增 get_col2list函数 cache参数，为False时不构建文件内容表，未缓存时逐行只读取该列；file_var_filter函数 const_mask参数，可按已知常量行掩码原样写出保留行
+* 新增 check_file_content函数 ret_const参数，列类型检查转换数值时一并累计各行最小/最大值，返回常量行掩码，调用方无需再次计算方差
+* 调整 call_log装饰器 支持print/off/count/time四种记录方式（环境变量CHECK_CALL_LOG或set_call_log设置），time方式退出时输出耗时汇总
 """
 # ---- ---- ---- ---- ---- #
 import sys
 import os
 import re
+import time
+import json
+import atexit
+import tracemalloc
 import codecs
 import chardet
-import subprocess
 import shutil
+import mmap
+import tempfile
+import io
+import itertools
+import csv
+import hashlib
+import heapq
+import struct
+import numpy as np
 import pandas as pd
-from collections import Counter
+from array import array
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from zipfile import ZipFile
-from functools import wraps
+from functools import wraps, partial, lru_cache
+from contextlib import contextmanager
 
 
-# import json
 # import glob
 # import argparse
 
 
+_CALL_LOG_MODES = ("print", "off", "count", "time")
+_CALL_LOG_MODE = os.environ.get("CHECK_CALL_LOG", "print").lower()
+if _CALL_LOG_MODE not in _CALL_LOG_MODES:
+    _CALL_LOG_MODE = "print"
+_CALL_STATS = {}  # 函数名: [调用次数, 累计耗时（秒）]
+
+
 def call_log(func):
-    """函数调用记录"""
+    """
+    函数调用记录，记录方式由环境变量CHECK_CALL_LOG或set_call_log设置：
+    print（默认，打印每次调用）、off（不记录）、count（统计调用次数）、time（统计调用次数及累计耗时，程序退出时输出汇总）
+    注意：导入本模块时CHECK_CALL_LOG为off，将不包装函数（零开销），此后无法再通过set_call_log开启记录
+    """
+    if _CALL_LOG_MODE == "off":
+        return func
+    name = func.__name__
 
     @wraps(func)
     def with_logging(*args, **kwargs):
-        print("调用 " + func.__name__)
-        return func(*args, **kwargs)
+        mode = _CALL_LOG_MODE
+        if mode == "print":
+            print("调用 " + name)
+            return func(*args, **kwargs)
+        elif mode == "off":
+            return func(*args, **kwargs)
+        stat = _CALL_STATS.setdefault(name, [0, 0.0])
+        stat[0] += 1
+        if mode == "count":
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stat[1] += time.perf_counter() - start
 
     return with_logging
 
 
+def set_call_log(mode="print"):
+    """
+    设置函数调用记录方式（同环境变量CHECK_CALL_LOG）
+    :param mode: 字符串，print/off/count/time，默认print
+    :return: 正常返回0，不支持的方式返回字符串报错信息
+    """
+    global _CALL_LOG_MODE
+    mode = str(mode).lower()
+    if mode not in _CALL_LOG_MODES:
+        return f"函数调用记录方式{mode}不被支持，只允许使用{_join_str(_CALL_LOG_MODES)}"
+    _CALL_LOG_MODE = mode
+    return 0
+
+
+def get_call_stats():
+    """
+    获取函数调用统计（count/time方式下记录）
+    :return: 字典，函数名: (调用次数, 累计耗时（秒）)，累计耗时包含其内部调用的其他函数
+    """
+    return {k: tuple(v) for k, v in _CALL_STATS.items()}
+
+
+def _dump_call_stats():
+    """程序退出时将函数调用统计输出到标准错误"""
+    if not _CALL_STATS:
+        return
+    if _CALL_LOG_MODE == "time":
+        items = sorted(_CALL_STATS.items(), key=lambda x: x[1][1], reverse=True)
+        sys.stderr.write("函数调用统计（按累计耗时排序）：\n函数\t调用次数\t累计耗时(秒)\n")
+    else:
+        items = sorted(_CALL_STATS.items(), key=lambda x: x[1][0], reverse=True)
+        sys.stderr.write("函数调用统计（按调用次数排序）：\n函数\t调用次数\t累计耗时(秒)\n")
+    for name, (count, cost) in items:
+        sys.stderr.write(f"{name}\t{count}\t{cost:.6f}\n")
+
+
+atexit.register(_dump_call_stats)
+
+
+_PROFILE = None  # 性能记录（start_profile开启）：开始时间、是否记录内存、已完成步骤记录、进行中步骤栈
+
+
+@call_log
+def start_profile(trace_memory=True):
+    """
+    开启各检查步骤耗时及内存峰值记录（默认关闭；记录内存时使用tracemalloc，会明显拖慢运行，仅排查问题时开启）
+    :param trace_memory: 布尔值，是否记录各步骤Python内存分配峰值，默认True
+    :return: 正常返回0
+    """
+    global _PROFILE
+    started = False
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        started = True
+    _PROFILE = dict(start=time.perf_counter(), wall=time.strftime('%Y-%m-%d %H:%M:%S', time.localtime()),
+                    trace_memory=bool(trace_memory), started=started, records=[], stack=[])
+    return 0
+
+
+@call_log
+def stop_profile():
+    """
+    结束性能记录，结束未完成的步骤，停止由start_profile开启的tracemalloc
+    :return: 性能记录字典（同write_profile写出内容），未开启时返回None
+    """
+    global _PROFILE
+    if _PROFILE is None:
+        return None
+    while _PROFILE["stack"]:
+        _step_exit()
+    report = _profile_report()
+    if _PROFILE["started"]:
+        tracemalloc.stop()
+    _PROFILE = None
+    return report
+
+
+@call_log
+def write_profile(out_file, add_info=""):
+    """
+    将当前性能记录写出为JSON（记录继续进行，可在任务结束前多次写出）
+    :param out_file: 字符串，输出文件，如tmp/cloud_error/profile.json
+    :param add_info: 字符串，附加信息
+    :return: 正常返回0，未开启记录或写出出错返回字符串报错信息
+    """
+    try:
+        if _PROFILE is None:
+            return f"{add_info}未开启性能记录"
+        out_dir = os.path.dirname(os.path.abspath(out_file))
+        if not os.path.exists(out_dir):
+            os.makedirs(out_dir)
+        with open(out_file, "w", encoding="UTF-8") as fileOU:
+            json.dump(_profile_report(), fileOU, ensure_ascii=False, indent=1)
+        return 0
+    except Exception as e:
+        print(e)
+        return f"{add_info}写出性能记录时出错"
+
+
+def _profile_report():
+    """由当前性能记录生成报告字典，步骤按开始时间排序，depth为嵌套层级"""
+    records = sorted(_PROFILE["records"], key=lambda x: (x["start"], x["depth"]))
+    report = dict(start_time=_PROFILE["wall"], total_seconds=round(time.perf_counter() - _PROFILE["start"], 6),
+                  trace_memory=_PROFILE["trace_memory"], steps=records)
+    if _PROFILE["trace_memory"] and tracemalloc.is_tracing():
+        report["current_mb"] = round(tracemalloc.get_traced_memory()[0] / 1048576, 3)
+    return report
+
+
+def _step_enter(name, detail=""):
+    """开始记录一个步骤；记录内存时先将外层步骤至今的峰值计入外层，再重置峰值"""
+    frame = dict(name=name, detail=detail, start=time.perf_counter(), mem=0, peak=0)
+    if _PROFILE["trace_memory"] and tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        if _PROFILE["stack"]:
+            _PROFILE["stack"][-1]["peak"] = max(_PROFILE["stack"][-1]["peak"], peak)
+        tracemalloc.reset_peak()
+        frame["mem"] = frame["peak"] = current
+    _PROFILE["stack"].append(frame)
+
+
+def _step_exit():
+    """结束最内层步骤并生成记录，步骤内存峰值同时计入外层步骤"""
+    if _PROFILE is None or not _PROFILE["stack"]:
+        return
+    frame = _PROFILE["stack"].pop()
+    record = dict(name=frame["name"], depth=len(_PROFILE["stack"]),
+                  start=round(frame["start"] - _PROFILE["start"], 6),
+                  seconds=round(time.perf_counter() - frame["start"], 6))
+    if frame["detail"]:
+        record["detail"] = frame["detail"]
+    if _PROFILE["trace_memory"] and tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        frame["peak"] = max(frame["peak"], peak)
+        record.update(start_mb=round(frame["mem"] / 1048576, 3), peak_mb=round(frame["peak"] / 1048576, 3),
+                      end_mb=round(current / 1048576, 3))
+        if _PROFILE["stack"]:
+            _PROFILE["stack"][-1]["peak"] = max(_PROFILE["stack"][-1]["peak"], frame["peak"])
+    _PROFILE["records"].append(record)
+
+
+@contextmanager
+def profile_step(name, detail=""):
+    """
+    性能记录步骤（with语句），未开启性能记录时不做任何事
+    :param name: 字符串，步骤名
+    :param detail: 字符串，附加说明，如文件名
+    """
+    if _PROFILE is None:
+        yield
+        return
+    _step_enter(name, detail)
+    try:
+        yield
+    finally:
+        _step_exit()
+
+
+class _StepMarks(object):
+    """
+    函数内分阶段性能记录：创建时开始整个函数的步骤，mark结束上一阶段并开始新阶段，done结束全部（放在finally中）；
+    未开启性能记录时不做任何事
+    """
+    __slots__ = ("name", "depth")
+
+    def __init__(self, name, detail=""):
+        """
+        :param name: 字符串，函数步骤名，阶段记录名为"函数步骤名.阶段名"
+        :param detail: 字符串，附加说明，如文件名
+        """
+        self.name = name
+        self.depth = 0
+        if _PROFILE is not None:
+            _step_enter(name, detail)
+            self.depth = 1
+
+    def mark(self, name):
+        """结束上一阶段（如有）并开始新阶段"""
+        if not self.depth:
+            return
+        if self.depth == 2:
+            _step_exit()
+        _step_enter(f"{self.name}.{name}")
+        self.depth = 2
+
+    def done(self):
+        """结束当前阶段及函数步骤"""
+        while self.depth:
+            _step_exit()
+            self.depth -= 1
+
+
 def _join_str(str_list, sep=","):
     """
     将对象元素对象转化为字符串格式，并以特定分隔符连接
@@ -96,46 +360,173 @@ def _convert_size(size_str):
     return convert_size
 
 
-def _get_encoding(in_file, confidence: float = 0.6, line=3000):
+_BOM_LIST = ((codecs.BOM_UTF32_LE, "UTF-32"), (codecs.BOM_UTF32_BE, "UTF-32"), (codecs.BOM_UTF8, "UTF-8-SIG"),
+             (codecs.BOM_UTF16_LE, "UTF-16"), (codecs.BOM_UTF16_BE, "UTF-16"))  # UTF-32需先于UTF-16判断
+
+
+_BASE_READ_MAX = 256 * 1024 * 1024  # check_file_base一次读入文件内容的上限，超出时分块读取文件
+
+
+def _iter_block(in_file, block_size=1048576):
     """
-    推测文件编码格式
-    :param in_file: 字符串，文件名
-    :param confidence: 置信度，含有中文的文件建议降低置信度，默认0.6
-    :param line: 读入行数，小文件为提升准确性建议设置为-1，即全部读入，默认3000
-    :return: 正常返回推测的文件编码格式（大写）
+    按固定大小分块读取二进制文件
+    :param in_file: 字符串，读取对象
+    :param block_size: 整数，数据块字节数，默认1M
+    :return: 生成器，二进制数据块
     """
-    code_format = ""
     with open(in_file, "rb") as fileIN:
-        test_data = fileIN.read(line)
-        format_res = chardet.detect(test_data)
-        if format_res["confidence"] > confidence:
-            code_format = format_res["encoding"].upper()
-            if re.findall('iso-8859', code_format.lower()):
-                code_format = "GBK"  # 中文语境下包含各种特殊符号
-        elif format_res["confidence"] > 0:
-            code_format = "GBK"  # 可能会报错
-    return code_format
+        while True:
+            block = fileIN.read(block_size)
+            if not block:
+                return
+            yield block
+
+
+def _bom_encoding(head: bytes):
+    """由文件开头字节识别BOM，无BOM返回空字符串"""
+    for bom, code_format in _BOM_LIST:
+        if head.startswith(bom):
+            return code_format
+    return ""
+
+
+def _write_convert(blocks, out_file, in_code, out_code="UTF-8", mode_file=None):
+    """
+    流式转码写出：二进制数据块经增量解码/编码写入同目录临时文件，完成后原子替换输出对象
+    :param blocks: 二进制数据块的可迭代对象
+    :param out_file: 字符串，输出对象
+    :param in_code: 字符串，输入编码
+    :param out_code: 字符串，输出编码，默认"UTF-8"
+    :param mode_file: 字符串，复制该文件权限到输出对象，None表示不复制
+    :return: 无返回，解码/编码失败抛出异常，输出对象保持原样
+    """
+    decoder = codecs.getincrementaldecoder(in_code)("strict")
+    encoder = codecs.getincrementalencoder(out_code)("strict")
+    out_file = os.path.abspath(out_file)
+    fd, tmp_file = tempfile.mkstemp(prefix=f".{os.path.basename(out_file)}.", dir=os.path.dirname(out_file))
+    try:
+        if mode_file is not None:
+            shutil.copymode(mode_file, tmp_file)
+        with os.fdopen(fd, "wb") as fileOU:
+            for block in blocks:
+                fileOU.write(encoder.encode(decoder.decode(block)))
+            fileOU.write(encoder.encode(decoder.decode(b"", final=True), final=True))
+        os.replace(tmp_file, out_file)
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+def _copy_data(in_file, out_file, link=False):
+    """
+    复制文件内容（shutil.copyfile），link为True时优先创建硬链接（原子替换输出对象），失败（如跨设备）时复制
+    :param in_file: 字符串，输入对象
+    :param out_file: 字符串，输出对象
+    :param link: 布尔值，是否优先创建硬链接，默认False
+    :return: 无返回，失败抛出异常
+    """
+    if link:
+        out_file = os.path.abspath(out_file)
+        tmp_file = os.path.join(os.path.dirname(out_file), f".{os.path.basename(out_file)}.{os.getpid()}.link")
+        try:
+            os.link(in_file, tmp_file)
+            os.replace(tmp_file, out_file)
+            return
+        except OSError:
+            if os.path.lexists(tmp_file):
+                os.remove(tmp_file)
+    shutil.copyfile(in_file, out_file)
 
 
-def _read_file(in_file, in_code, block_size=102400):
+def _utf8_encoding(blocks):
     """
-    一定区块大小按照指定格式构建指定文件生成器
-    :param in_file: 输入文件
-    :param in_code: 读入格式
-    :param block_size: *读入数据块大小
-    :return: 正常返回一定区块大小的字符串的生成器，读入失败返回报错信息
+    分块严格按UTF-8解码（快速判断，避免chardet）
+    :param blocks: 二进制数据块的可迭代对象
+    :return: 全部为ASCII返回"ASCII"，合法UTF-8返回"UTF-8"，否则（含非法字节、NUL字符或空数据）返回空字符串
     """
-    in_code = in_code.upper()
+    decoder = codecs.getincrementaldecoder("utf-8")("strict")
+    ascii_only = True
+    size = 0
     try:
-        with codecs.open(in_file, "r", in_code) as fileIN:
-            while True:
-                content_block = fileIN.read(block_size)
-                if content_block:
-                    yield content_block
-                else:
-                    return
-    except Exception as e:
-        return e
+        for block in blocks:
+            if b"\x00" in block:
+                return ""  # 文本文件不含NUL，疑似二进制或无BOM的UTF-16/32文件
+            size += len(block)
+            if ascii_only and block.isascii():
+                continue
+            ascii_only = False
+            decoder.decode(block)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return ""
+    if not size:
+        return ""
+    return "ASCII" if ascii_only else "UTF-8"
+
+
+def _chardet_encoding(blocks, confidence: float = 0.6, line=1048576):
+    """
+    以chardet增量检测编码，逐块送入直至检测器足够置信或达到字节上限
+    :param blocks: 二进制数据块的可迭代对象
+    :param confidence: 置信度，默认0.6
+    :param line: 整数，最多送入检测的字节数，-1表示不限，默认1M
+    :return: 推测的文件编码格式（大写），无法推测返回空字符串，推测为二进制文件返回None
+    """
+    code_format = ""
+    detector = chardet.UniversalDetector()
+    fed = 0
+    for block in blocks:
+        if line >= 0 and fed + len(block) > line:
+            block = block[:line - fed]
+        detector.feed(block)
+        fed += len(block)
+        if detector.done or 0 <= line <= fed:
+            break
+    format_res = detector.close()
+    if format_res["encoding"] is None and format_res["confidence"] > confidence:
+        return None  # 推测为二进制文件
+    if format_res["confidence"] > confidence:
+        code_format = format_res["encoding"].upper()
+        if re.findall('iso-8859', code_format.lower()):
+            code_format = "GBK"  # 中文语境下包含各种特殊符号
+    elif format_res["confidence"] > 0:
+        code_format = "GBK"  # 可能会报错
+    return code_format
+
+
+def _iter_data(data: bytes, block_size=1048576):
+    """
+    按固定大小切分已读入的二进制内容，与_iter_block一致
+    :param data: 二进制内容
+    :param block_size: 整数，数据块字节数，默认1M
+    :return: 生成器，二进制数据块
+    """
+    for i in range(0, len(data), block_size):
+        yield data[i:i + block_size]
+
+
+def _get_encoding(in_file, confidence: float = 0.6, line=1048576, data: bytes = None, utf8_code: str = None):
+    """
+    推测文件编码格式：先识别BOM，再分块严格按ASCII/UTF-8解码，均不符合时才使用chardet增量检测
+    :param in_file: 字符串，文件名
+    :param confidence: 置信度，含有中文的文件建议降低置信度，默认0.6
+    :param line: 整数，chardet检测时最多读入字节数，-1表示全部读入，默认1M
+    :param data: 二进制内容，已读入文件内容时传入，不再读取in_file，默认None
+    :param utf8_code: 字符串，已得到的_utf8_encoding结果，传入时不再严格解码，默认None
+    :return: 正常返回推测的文件编码格式（大写），推测为二进制文件返回None
+    """
+    if data is None:
+        with open(in_file, "rb") as fileIN:
+            code_format = _bom_encoding(fileIN.read(4))
+        iter_block = partial(_iter_block, in_file)
+    else:
+        code_format = _bom_encoding(data[:4])
+        iter_block = partial(_iter_data, data)
+    if not code_format:
+        code_format = _utf8_encoding(iter_block()) if utf8_code is None else utf8_code
+    if not code_format:
+        code_format = _chardet_encoding(iter_block(block_size=65536), confidence=confidence, line=line)
+    return code_format
 
 
 def _read_line(in_file, rm_br=True):
@@ -177,6 +568,380 @@ def _path_pre_proc(path: str):
     return path
 
 
+class _LineIndex(object):
+    """
+    文件行偏移索引：一次扫描（mmap）记录每行起始字节位置，按行号直接定位读取，行号及空白行规则与_read_line一致
+    """
+    __slots__ = ("mm", "bounds", "stop_no")
+    # codecs按行读入时，除换行符外以下字符同样视为行边界，出现时退回按文本切分行
+    _other_br = re.compile(rb"\r(?!\n)|[\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+
+    def __init__(self, in_file):
+        """
+        :param in_file: 字符串，索引对象
+        """
+        self.mm = None
+        self.bounds = np.zeros(1, dtype=np.int64)
+        self.stop_no = 1
+        if os.path.getsize(in_file) == 0:
+            return
+        with open(in_file, "rb") as fileIN:
+            self.mm = mmap.mmap(fileIN.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self.mm)
+        if self._other_br.search(self.mm):
+            text = self.mm[:].decode("UTF-8", errors="surrogateescape")
+            lengths = [len(x.encode("UTF-8", errors="surrogateescape")) for x in text.splitlines(keepends=True)]
+            bounds = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+        else:
+            br_pos = np.flatnonzero(np.frombuffer(self.mm, dtype=np.uint8) == 10)
+            bounds = np.concatenate(([0], br_pos + 1))
+            if bounds[-1] != size:
+                bounds = np.append(bounds, size)
+        self.bounds = bounds.astype(np.int64)
+        # 首个空行（仅含换行符）或首个无法解码行处_read_line停止读取，其后各行均不可读
+        self.stop_no = len(self.bounds)
+        bad_pos = self._bad_pos()
+        if bad_pos is not None:
+            self.stop_no = int(np.searchsorted(self.bounds, bad_pos, side="right"))
+        line_nos = np.flatnonzero(np.diff(self.bounds[:self.stop_no]) <= 3) + 1
+        for line_no in line_nos:
+            if not self._raw(line_no).rstrip(b"\r\n"):
+                self.stop_no = int(line_no)
+                break
+
+    def _bad_pos(self, block_size=16777216):
+        decoder = codecs.getincrementaldecoder("UTF-8")()
+        for start in range(0, len(self.mm), block_size):
+            try:
+                decoder.decode(self.mm[start:start + block_size], final=start + block_size >= len(self.mm))
+            except UnicodeDecodeError as e:
+                return start + e.start
+        return None
+
+    def _raw(self, line_no):
+        return self.mm[self.bounds[line_no - 1]:self.bounds[line_no]]
+
+    def line(self, line_num=1):
+        """
+        按行号读取一行（移除行尾换行符），与get_row_line逐行读取结果一致
+        :param line_num: 正整数，行号
+        :return: 正常返回行字符串，空白行、超出范围或无法解码时返回None
+        """
+        if not 1 <= line_num < self.stop_no:
+            return None
+        try:
+            line = self._raw(line_num).decode("UTF-8").rstrip("\r\n")
+        except UnicodeDecodeError:
+            return None
+        if line.isspace():
+            return None
+        return line
+
+    def close(self):
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+
+
+_LINE_INDEX_CACHE = OrderedDict()
+_LINE_INDEX_MAX = 8
+
+
+def _get_line_index(in_file):
+    """
+    获取文件行偏移索引，按文件路径、修改时间及大小缓存，文件变动后自动重建
+    :param in_file: 字符串，索引对象
+    :return: 正常返回_LineIndex对象
+    """
+    path = os.path.abspath(in_file)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _LINE_INDEX_CACHE.pop(path, None)
+    if cached is not None and cached[0] == key:
+        _LINE_INDEX_CACHE[path] = cached
+        return cached[1]
+    if cached is not None:
+        cached[1].close()
+    index = _LineIndex(path)
+    _LINE_INDEX_CACHE[path] = (key, index)
+    while len(_LINE_INDEX_CACHE) > _LINE_INDEX_MAX:
+        _LINE_INDEX_CACHE.popitem(last=False)[1][1].close()
+    return index
+
+
+_FILE_DIM_CACHE = OrderedDict()
+_FILE_DIM_MAX = 64
+
+
+def _get_file_dim(in_file, block_size=1048576):
+    """
+    分块统计文件换行符个数并获取最后一行内容（同awk的NR及最后一条记录），按文件路径、修改时间及大小缓存
+    :param in_file: 字符串，统计对象
+    :param block_size: 整数，读入数据块大小，默认1M
+    :return: 正常返回元组（行数，最后一行字节串）
+    """
+    path = os.path.abspath(in_file)
+    stat = os.stat(path)
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _FILE_DIM_CACHE.pop(path, None)
+    if cached is not None and cached[0] == key:
+        _FILE_DIM_CACHE[path] = cached
+        return cached[1]
+    row_num = 0
+    last_line = b""
+    with open(path, "rb") as fileIN:
+        while True:
+            block = fileIN.read(block_size)
+            if not block:
+                break
+            row_num += block.count(b"\n")
+        size = fileIN.tell()
+        if size:
+            fileIN.seek(size - 1)
+            end = size - 1 if fileIN.read(1) == b"\n" else size
+            if end == size:
+                row_num += 1  # 末行无换行符
+            start = end
+            while start > 0:
+                step = min(block_size, start)
+                fileIN.seek(start - step)
+                block = fileIN.read(step)
+                br_pos = block.rfind(b"\n")
+                if br_pos >= 0:
+                    start = start - step + br_pos + 1
+                    break
+                start -= step
+            fileIN.seek(start)
+            last_line = fileIN.read(end - start)
+    _FILE_DIM_CACHE[path] = (key, (row_num, last_line))
+    while len(_FILE_DIM_CACHE) > _FILE_DIM_MAX:
+        _FILE_DIM_CACHE.popitem(last=False)
+    return row_num, last_line
+
+
+def _line_digest(line):
+    """
+    行内容定长摘要（16字节），用于重复行检查
+    :param line: 字符串，行内容
+    :return: 字节串摘要
+    """
+    return hashlib.blake2b(line.encode("UTF-8", errors="surrogatepass"), digest_size=16).digest()
+
+
+def _external_dup_line_nos(in_file, chunk_lines=1000000):
+    """
+    外部排序查找重复行：分块排序（行摘要，行号）写入临时文件后归并，内存占用仅与分块大小有关
+    :param in_file: 字符串，检查对象
+    :param chunk_lines: 正整数，每个排序分块的行数，默认1000000
+    :return: 重复行（首次出现之外）行号升序列表
+    """
+    record = struct.Struct(">16sQ")
+    tmp_dir = tempfile.mkdtemp(prefix=".line_dup.")
+
+    def dump(chunk_list):
+        chunk_file = os.path.join(tmp_dir, str(len(chunk_files)))
+        chunk_list.sort()
+        with open(chunk_file, "wb") as fileOU:
+            fileOU.write(b"".join(record.pack(*x) for x in chunk_list))
+        chunk_files.append(chunk_file)
+
+    def load(chunk_file):
+        with open(chunk_file, "rb") as fileIN:
+            while True:
+                block = fileIN.read(record.size * 4096)
+                if not block:
+                    return
+                yield from record.iter_unpack(block)
+
+    try:
+        chunk_files = []
+        chunk = []
+        for line, line_no in _read_line(in_file):
+            chunk.append((_line_digest(line), line_no))
+            if len(chunk) >= chunk_lines:
+                dump(chunk)
+                chunk = []
+        if chunk:
+            dump(chunk)
+        dup_nos = []
+        last_digest = None
+        for digest, line_no in heapq.merge(*[load(x) for x in chunk_files]):
+            if digest == last_digest:
+                dup_nos.append(line_no)
+            last_digest = digest
+        dup_nos.sort()
+        return dup_nos
+    finally:
+        shutil.rmtree(tmp_dir, True)
+
+
+def _fill_null(in_list, null_list: list = None):
+    """
+    将列表中的缺失数据统一替换为NA
+    :param in_list: 列表，处理对象
+    :param null_list: 字符串/字符串列表，指定原数据表示缺失数据的符号，默认["", "NA", "N/A", "NULL"]
+    :return: 替换后的新列表
+    """
+    if isinstance(null_list, str):
+        null_list = [null_list, ]
+    if null_list is None:
+        null_list = ["", "NA", "N/A", "NULL"]
+    null_set = set(null_list)
+    return ["NA" if x in null_set else x for x in in_list]
+
+
+class _FileTable(object):
+    """
+    文件内容表：一次读入文件并切分全部行元素，供行/列元素列表反复取用，避免每次取行/列时重新扫描文件。
+    全部元素以换行符连接存放在一块连续的UTF-8字节缓冲中（元素内不会含有换行符），另以numpy数组记录各元素起始偏移、
+    各行首个元素下标及行号，不为每个元素常驻一个字符串对象；取行/列时才一次拷贝、一次解码生成该行/列的元素列表
+    """
+    __slots__ = ("buf", "cell_start", "row_ptr", "line_nos", "nbytes")
+
+    def __init__(self, buf, row_sizes, line_nos):
+        """
+        :param buf: bytearray，全部元素UTF-8编码，每个元素后接一个换行符
+        :param row_sizes: 整数序列，各行元素个数
+        :param line_nos: 整数序列，各行对应的文件行号（空白行计入行号，与_read_line一致）
+        """
+        offset_type = np.int32 if len(buf) < 2 ** 31 else np.int64
+        self.buf = buf
+        ends = np.flatnonzero(np.frombuffer(buf, dtype=np.uint8) == 10)
+        self.cell_start = np.zeros(len(ends) + 1, dtype=offset_type)  # 末位为缓冲长度，元素k字节范围[start[k], start[k+1]-1)
+        self.cell_start[1:] = ends + 1
+        self.row_ptr = np.zeros(len(row_sizes) + 1, dtype=offset_type)  # 第i行元素下标范围[row_ptr[i], row_ptr[i+1])
+        np.cumsum(np.asarray(row_sizes, dtype=offset_type), out=self.row_ptr[1:])
+        self.line_nos = np.asarray(line_nos, dtype=np.int64)
+        self.nbytes = len(buf) + self.cell_start.nbytes + self.row_ptr.nbytes + self.line_nos.nbytes + 200
+
+    def _cells(self, cells):
+        """
+        按元素下标数组取元素字符串列表
+        :param cells: numpy整数数组，元素下标
+        :return: 字符串列表
+        """
+        if not len(cells):
+            return []
+        starts = self.cell_start[cells].astype(np.int64)
+        sizes = self.cell_start[cells + 1] - starts  # 含元素后的换行符
+        shift = starts - (np.cumsum(sizes) - sizes)
+        index = np.repeat(shift, sizes) + np.arange(int(sizes.sum()))
+        text = np.frombuffer(self.buf, dtype=np.uint8)[index].tobytes().decode("UTF-8")
+        return text.split("\n")[:-1]
+
+    def row2list(self, row_no=1, fill_null=False, null_list: list = None):
+        """
+        获取指定一行的元素列表，与get_row2list结果一致
+        :param row_no: 正整数，指定行号，默认1
+        :param fill_null: 布尔值，是否将缺失数据统一替换为NA，默认False
+        :param null_list: 字符串/字符串列表，指定原数据表示缺失数据的符号，默认["", "NA", "N/A", "NULL"]
+        :return: 正常返回指定行元素列表，行不存在无返回
+        """
+        index = int(np.searchsorted(self.line_nos, row_no))
+        if index >= len(self.line_nos) or self.line_nos[index] != row_no:
+            return None
+        start = self.cell_start[self.row_ptr[index]]
+        end = self.cell_start[self.row_ptr[index + 1]] - 1
+        row_list = self.buf[start:end].decode("UTF-8").split("\n")
+        if fill_null:
+            return _fill_null(row_list, null_list)
+        return row_list
+
+    def col2list(self, col_no=1, fill_null=False, null_list: list = None):
+        """
+        获取指定一列的元素列表，与get_col2list结果一致
+        :param col_no: 正整数，指定列号，默认1
+        :param fill_null: 布尔值，是否将缺失数据统一替换为NA，默认False
+        :param null_list: 字符串/字符串列表，指定原数据表示缺失数据的符号，默认["", "NA", "N/A", "NULL"]
+        :return: 正常返回指定列元素列表，错误无返回
+        """
+        try:
+            if not isinstance(col_no, (int, np.integer)):
+                raise TypeError(f"list indices must be integers or slices, not {type(col_no).__name__}")
+            row_sizes = np.diff(self.row_ptr)
+            col_index = col_no - 1 if col_no > 0 else row_sizes + (col_no - 1)  # 列号非正时同列表负下标
+            if np.any((col_index < 0) | (col_index >= row_sizes)):
+                raise IndexError("list index out of range")
+            col_list = self._cells(self.row_ptr[:-1] + col_index)
+            if fill_null:
+                col_list = _fill_null(col_list, null_list)
+            return col_list
+        except Exception as e:
+            print(e)
+
+
+def _load_table(in_file, sep="\t", rm_blank=True):
+    """
+    一次读入文件并构建文件内容表，元素切分方式与get_row2list/get_col2list一致
+    :param in_file: 字符串，读取对象
+    :param sep: 字符串，行元素间分隔符，默认"\t"
+    :param rm_blank: 布尔值，是否移除元素前后空白，默认True
+    :return: 正常返回_FileTable对象
+    """
+    buf = bytearray()
+    row_sizes = array("q")
+    line_nos = array("q")
+    for line, line_no in _read_line(in_file):
+        row_list = line.split(sep)
+        if rm_blank:
+            row_list = [x.strip() for x in row_list]
+        buf += "\n".join(row_list).encode("UTF-8")
+        buf += b"\n"
+        row_sizes.append(len(row_list))
+        line_nos.append(line_no)
+    return _FileTable(buf, row_sizes, line_nos)
+
+
+_TABLE_CACHE = OrderedDict()
+_TABLE_CACHE_MAX = 16  # 最多缓存文件内容表个数
+_TABLE_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # 缓存文件内容表估算内存上限，默认1G
+
+
+def _get_table(in_file, sep="\t", rm_blank=True):
+    """
+    获取文件内容表，按文件路径、修改时间、大小、分隔符及去空白选项缓存（LRU淘汰，总内存受_TABLE_CACHE_MAX_BYTES限制），
+    同一文件在一次任务中只切分一次
+    :param in_file: 字符串，读取对象
+    :param sep: 字符串，行元素间分隔符，默认"\t"
+    :param rm_blank: 布尔值，是否移除元素前后空白，默认True
+    :return: 正常返回_FileTable对象
+    """
+    path = os.path.abspath(in_file)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return _load_table(path, sep=sep, rm_blank=rm_blank)  # 文件不存在等情况不缓存，结果同逐行读取
+    key = (path, stat.st_mtime_ns, stat.st_size, sep, bool(rm_blank))
+    table = _TABLE_CACHE.pop(key, None)
+    if table is None:
+        table = _load_table(path, sep=sep, rm_blank=rm_blank)
+        for old_key in [x for x in _TABLE_CACHE if x[0] == path and x[1:3] != key[1:3]]:
+            del _TABLE_CACHE[old_key]  # 文件已变动，旧内容表作废
+    if table.nbytes <= _TABLE_CACHE_MAX_BYTES:
+        _TABLE_CACHE[key] = table
+        while len(_TABLE_CACHE) > _TABLE_CACHE_MAX or \
+                sum(x.nbytes for x in _TABLE_CACHE.values()) > _TABLE_CACHE_MAX_BYTES:
+            _TABLE_CACHE.popitem(last=False)
+    return table
+
+
+def _cached_table(in_file, sep="\t", rm_blank=True):
+    """
+    获取已缓存且未过期的文件内容表，不触发读入
+    :return: 已缓存返回_FileTable对象，否则返回None
+    """
+    try:
+        path = os.path.abspath(in_file)
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_mtime_ns, stat.st_size, sep, bool(rm_blank))
+    if key in _TABLE_CACHE:
+        _TABLE_CACHE.move_to_end(key)
+        return _TABLE_CACHE[key]
+    return None
+
+
 @call_log
 def str_length(in_str: str, length: int = None, min_len: int = 1, max_len: int = 20, other_str="", add_info=""):
     """
@@ -208,6 +973,52 @@ def str_length(in_str: str, length: int = None, min_len: int = 1, max_len: int =
         return f"{add_info}字符串长度检查时出错"
 
 
+_STR_FORMAT = (r"^[A-Za-z1-9][A-Za-z0-9-.]*$", r"[^A-Za-z0-9-.]", r"^[^A-Za-z1-9]", r"[^A-Za-z0-9]$")
+_LIST_FORMAT = (r'^[A-Za-z0-9]([A-Za-z0-9._-])*$', r"[^A-Za-z0-9._-]", r"^[^A-Za-z0-9]", r"[^A-Za-z0-9]$")
+
+
+@lru_cache(maxsize=128)
+def _re_compile(pattern, flags=0):
+    """
+    编译正则（按表达式缓存，仅编译一次）
+    :param pattern: 字符串，正则表达式
+    :param flags: 整数，re模块标志位
+    :return: re.compile对象
+    """
+    return re.compile(pattern, flags)
+
+
+def _format_patterns(re_obj, re_ban_body, ck_head, re_ban_head, ck_tail, re_ban_tail, default):
+    """
+    补全正则格式检查所用编译对象，字符串形式的正则经缓存编译（默认值仅在re_obj为None时补全）
+    :param default: 元组，默认的（允许格式，非法主体字符，非法起始字符，非法结尾字符）正则表达式
+    :return: 元组，（允许格式，非法主体字符，非法起始字符，非法结尾字符）编译对象
+    """
+    re_obj, re_ban_body, re_ban_head, re_ban_tail = (
+        _re_compile(x) if isinstance(x, str) else x for x in (re_obj, re_ban_body, re_ban_head, re_ban_tail))
+    if re_obj is None:
+        re_obj = _re_compile(default[0])
+        if re_ban_body is None:
+            re_ban_body = _re_compile(default[1])
+        if ck_head and re_ban_head is None:
+            re_ban_head = _re_compile(default[2])
+        if ck_tail and re_ban_tail is None:
+            re_ban_tail = _re_compile(default[3])
+    return re_obj, re_ban_body, re_ban_head, re_ban_tail
+
+
+def _format_mask(in_list, re_obj):
+    """
+    列表字符串正则格式整体匹配（非字符串元素视为不匹配）
+    :param in_list: 列表，检查对象
+    :param re_obj: re.compile对象，允许的正则格式编译
+    :return: numpy布尔数组，符合格式的位置为True
+    """
+    match = re_obj.match
+    return np.fromiter((isinstance(x, str) and match(x) is not None for x in in_list),
+                       dtype=bool, count=len(in_list))
+
+
 @call_log
 def str_format(in_str: str, re_obj=None, re_ban_body=None, ck_head=True, re_ban_head=None,
                ck_tail=False, re_ban_tail=None, other_str="", add_info=''):
@@ -226,17 +1037,12 @@ def str_format(in_str: str, re_obj=None, re_ban_body=None, ck_head=True, re_ban_
     """
     try:
         s_str = other_str if other_str else in_str
-        if re_obj is None:
-            re_obj = re.compile(r"^[A-Za-z1-9][A-Za-z0-9-.]*$")
-            if re_ban_body is None:
-                re_ban_body = re.compile(r"[^A-Za-z0-9-.]")
-            if ck_head and re_ban_head is None:
-                re_ban_head = re.compile(r"^[^A-Za-z1-9]")
-            if ck_tail and re_ban_tail is None:
-                re_ban_tail = re.compile(r"[^A-Za-z0-9]$")
-            if not ck_head:
-                re_ban_head = re_ban_body
-        if re.match(re_obj, in_str):
+        use_default = re_obj is None
+        re_obj, re_ban_body, re_ban_head, re_ban_tail = _format_patterns(
+            re_obj, re_ban_body, ck_head, re_ban_head, ck_tail, re_ban_tail, _STR_FORMAT)
+        if use_default and not ck_head:
+            re_ban_head = re_ban_body
+        if re_obj.match(in_str):
             return 0
         else:
             msg1 = ""
@@ -503,6 +1309,20 @@ def file_suffix(in_file, suffix_list: list = None, add_info=""):
         return f"{add_info}文件后缀检查时出错"
 
 
+def _null_msg(in_file, doc_size: int, add_info=""):
+    """由文件大小判断是否为空文件，非空返回0，空返回字符串报错信息"""
+    if doc_size == 0:
+        return f"{add_info}输入文件{os.path.basename(in_file)}的大小为0，请检查文件是否为空"
+    return 0
+
+
+def _size_msg(in_file, doc_size: int, max_size="50M", add_info=""):
+    """由文件大小判断是否超出限制，未超出返回0，超出返回字符串报错信息"""
+    if doc_size > _convert_size(max_size):
+        return f"{add_info}输入文件{os.path.basename(in_file)}的大小为{doc_size},超过了{max_size}的限制"
+    return 0
+
+
 @call_log
 def file_null(in_file, add_info=""):
     """
@@ -512,11 +1332,7 @@ def file_null(in_file, add_info=""):
     :return: 非空返回0，空返回字符串报错信息
     """
     try:
-        if os.path.getsize(in_file) == 0:
-            in_file_name = os.path.basename(in_file)
-            return f"{add_info}输入文件{in_file_name}的大小为0，请检查文件是否为空"
-        else:
-            return 0
+        return _null_msg(in_file, doc_size=os.path.getsize(in_file), add_info=add_info)
     except Exception as e:
         print(e)
         return f"{add_info}空文件检查时出错"
@@ -532,24 +1348,20 @@ def file_size(in_file, max_size="50M", add_info=""):
     :return: 未超出返回0，超出返回字符串报错信息
     """
     try:
-        max_byte = _convert_size(max_size)
-        doc_size = os.path.getsize(in_file)
-        if doc_size > max_byte:
-            in_file_name = os.path.basename(in_file)
-            return f"{add_info}输入文件{in_file_name}的大小为{doc_size},超过了{max_size}的限制"
-        else:
-            return 0
+        return _size_msg(in_file, doc_size=os.path.getsize(in_file), max_size=max_size, add_info=add_info)
     except Exception as e:
         print(e)
         return f"{add_info}文件大小检查时出错"
 
 
 @call_log
-def file_encoding(in_file, allowed_encode: list = None, add_info=""):
+def file_encoding(in_file, allowed_encode: list = None, data: bytes = None, utf8_code: str = None, add_info=""):
     """
     检查编码格式是否在允许范围内（默认UTF-8）（二进制文件如xlsx，无法检测文件编码）
     :param in_file: 字符串，检查对象,例如："D:\a.txt"
     :param allowed_encode: 字符串/字符串列表，允许的编码格式，不区分大小写,默认UTF-8
+    :param data: 二进制内容，已读入文件内容时传入，不再读取in_file，默认None
+    :param utf8_code: 字符串，已完成的严格UTF-8解码结果（"ASCII"/"UTF-8"/""），传入时不再解码，默认None
     :param add_info: 字符串，附加信息
     :return: 范围内返回0，范围外返回字符串，推测的文件编码格式（大写），二进制文件返回None
     """
@@ -560,7 +1372,7 @@ def file_encoding(in_file, allowed_encode: list = None, add_info=""):
             allowed_encode = [allowed_encode.upper(), ]
         else:
             allowed_encode = list(map(lambda x: x.upper(), allowed_encode))
-        doc_encoding = _get_encoding(in_file)
+        doc_encoding = _get_encoding(in_file, data=data, utf8_code=utf8_code)
         if doc_encoding in allowed_encode:
             return 0
         else:
@@ -571,37 +1383,39 @@ def file_encoding(in_file, allowed_encode: list = None, add_info=""):
 
 
 @call_log
-def file_convert(in_file, in_code: str, out_file=None, out_code="UTF-8", add_info=""):
+def file_convert(in_file, in_code: str, out_file=None, out_code="UTF-8", data: bytes = None, link=False,
+                 utf8_code: str = None, add_info=""):
     """
-    文件编码转换
+    文件编码转换，输入已为合法UTF-8且输出为UTF-8时不转码：同一文件直接跳过，否则直接复制
     :param in_file: 字符串，输入对象，例如："D:\a.txt"
     :param in_code: 字符串，输入文件编码，不区分大小写，必需参数
     :param out_file: 字符串，输出对象，例如："D:\b.txt"，默认在in_file后添加".convert"
     :param out_code: 字符串，输出文件编码，目标格式，不区分大小写，默认"UTF-8"
+    :param data: 二进制内容，已读入in_file内容时传入，不再读取in_file，默认None
+    :param link: 布尔值，不转码时是否以硬链接代替复制（失败时仍复制），注意后续原地修改输出文件将同时修改输入文件，默认False
+    :param utf8_code: 字符串，已完成的严格UTF-8解码结果（"ASCII"/"UTF-8"/""），传入时不再解码，默认None
     :param add_info: 字符串，附加信息
     :return: 正常返回0，失败返回字符串报错信息
     """
     try:
         if out_file is None:
             out_file = str(in_file) + '.convert'
-        flag = ''
-        if os.path.abspath(in_file) == os.path.abspath(out_file):
-            flag += '1'
-            out_file = str(out_file) + '.convert'
         in_file_name = os.path.basename(in_file)
         if not in_code:
             return f"{add_info}{in_file_name}编码格式不被支持，请转为{out_code}编码后重试"
         in_code = in_code.upper()
         out_code = out_code.upper()
         try:
-            with codecs.open(out_file, "w", out_code) as fileOU:
-                for i in _read_file(in_file, in_code=in_code):
-                    if isinstance(i, Exception):
-                        return repr(i)
-                    fileOU.write(i)
-            if flag:
-                os.system(f'cp -r {out_file} {in_file}')
-                os.system(f'rm {out_file}')
+            iter_block = partial(_iter_block, in_file) if data is None else partial(_iter_data, data)
+            if codecs.lookup(out_code).name == "utf-8" and codecs.lookup(in_code).name in ("utf-8", "ascii"):
+                valid_code = ("ASCII", ) if codecs.lookup(in_code).name == "ascii" else ("ASCII", "UTF-8")
+                if utf8_code is None:
+                    utf8_code = _utf8_encoding(iter_block())
+                if utf8_code in valid_code:  # 内容已为合法UTF-8，无需转码
+                    if os.path.abspath(in_file) != os.path.abspath(out_file):
+                        _copy_data(in_file, out_file, link=link)
+                    return 0
+            _write_convert(iter_block(), out_file, in_code=in_code, out_code=out_code, mode_file=in_file)
             return 0
         except Exception as e:
             print(e)
@@ -646,7 +1460,7 @@ def check_file_base(in_file, ck_exist=True, ck_suffix=True, ck_null=True,
                     suffix_list: list = None,
                     max_size="50M",
                     allowed_encode: list = None,
-                    out_file=None, out_code="UTF-8",
+                    out_file=None, out_code="UTF-8", out_link=False,
                     add_info=""):
     """
     文件基础检查（存在，后缀，空文件，大小，编码）,提供转码选项，
@@ -664,39 +1478,61 @@ def check_file_base(in_file, ck_exist=True, ck_suffix=True, ck_null=True,
     :param allowed_encode: 字符串/字符串列表，允许的编码格式，不区分大小写，默认[UTF-8, ASCII]
     :param out_file: 字符串，输出对象,例如："D:\b.txt"，默认在in_file后添加".convert"
     :param out_code: 字符串，输出文件编码，默认UTF-8
+    :param out_link: 布尔值，无需转码时是否以硬链接代替复制生成out_file，注意此后原地修改out_file（非替换）将同时修改in_file，默认False
     :param add_info: 字符串，附加信息
     :return: 符合期望返回0，不符合返回报错信息列表
     """
     if allowed_encode is None:
         allowed_encode = ["UTF-8", "ASCII"]
+    marks = _StepMarks("check_file_base", os.path.basename(str(in_file)))
     try:
         error_list = []
-        if ck_exist:
-            err_msg = file_exist(in_file=in_file)
-            if err_msg:
-                error_list.append(f"{add_info}{err_msg}")
+        marks.mark("stat")
+        try:
+            doc_size = os.stat(in_file).st_size  # 只获取一次文件信息
+        except OSError:
+            doc_size = None
+        if doc_size is None:  # 文件不存在，报错同逐项检查，不再检查编码及转码
+            for ck_flag, ck_func in ((ck_exist, file_exist), (ck_suffix, partial(file_suffix, suffix_list=suffix_list)),
+                                     (ck_null, file_null), (ck_size, partial(file_size, max_size=max_size))):
+                err_msg = ck_func(in_file=in_file) if ck_flag else 0
+                if err_msg:
+                    error_list.append(f"{add_info}{err_msg}")
+            return error_list if error_list else 0
         if ck_suffix:
+            marks.mark("suffix")
             err_msg = file_suffix(in_file=in_file, suffix_list=suffix_list)
             if err_msg:
                 error_list.append(f"{add_info}{err_msg}")
         if ck_null:
-            err_msg = file_null(in_file=in_file)
+            marks.mark("null")
+            err_msg = _null_msg(in_file, doc_size=doc_size)
             if err_msg:
                 error_list.append(f"{add_info}{err_msg}")
+        size_err = 0
         if ck_size:
-            err_msg = file_size(in_file=in_file, max_size=max_size)
-            if err_msg:
-                error_list.append(f"{add_info}{err_msg}")
+            marks.mark("size")
+            size_err = _size_msg(in_file, doc_size=doc_size, max_size=max_size)
+            if size_err:
+                error_list.append(f"{add_info}{size_err}")
         if ck_encoding:
-            err_msg = file_encoding(in_file=in_file, allowed_encode=allowed_encode)
+            marks.mark("read")
+            data = None
+            if doc_size <= _BASE_READ_MAX and not size_err:  # 超出大小上限的文件不整体读入，分块读取
+                with open(in_file, "rb") as fileIN:
+                    data = fileIN.read()  # 只读入一次，编码检测及转码共用
+            marks.mark("encoding")
+            utf8_code = _utf8_encoding(_iter_block(in_file) if data is None else _iter_data(data))  # 只严格解码一次
+            err_msg = file_encoding(in_file=in_file, allowed_encode=allowed_encode, data=data, utf8_code=utf8_code)
             if err_msg is None:
                 error_list.append(f"{add_info}推测{os.path.basename(in_file)}文件为二进制文件（如xlsx），无法识别文件编码及转码")
             elif do_convert:
                 in_code = "UTF-8"
                 if err_msg:
                     in_code = err_msg
-                err_msg = file_convert(in_file=in_file, out_file=out_file,
-                                       in_code=in_code, out_code=out_code)
+                marks.mark("convert")
+                err_msg = file_convert(in_file=in_file, out_file=out_file, in_code=in_code, out_code=out_code,
+                                       data=data, link=out_link, utf8_code=utf8_code)
                 if err_msg:
                     error_list.append(f"{add_info}{err_msg}")
             elif err_msg and not do_convert:
@@ -708,18 +1544,31 @@ def check_file_base(in_file, ck_exist=True, ck_suffix=True, ck_null=True,
     except Exception as e:
         print(e)
         return [f"{add_info}文件基础检查时出错", ]
+    finally:
+        marks.done()
+
+
+@call_log
+def clear_file_cache():
+    """
+    清空文件内容表、行偏移索引及行列数缓存（批量任务间或需立即释放内存时使用）
+    :return: 无返回
+    """
+    _TABLE_CACHE.clear()
+    while _LINE_INDEX_CACHE:
+        _LINE_INDEX_CACHE.popitem()[1][1].close()
+    _FILE_DIM_CACHE.clear()
 
 
 @call_log
 def get_row_num(in_file):
     """
-    获取文件行数
+    获取文件行数（分块统计换行符，结果按文件缓存）
     :param in_file: 字符串，检查对象,例如："D:\a.txt"
     :return: 正常返回整数
     """
     try:
-        out = subprocess.getoutput("awk 'END{print NR}' %s" % in_file)
-        return int(out.split()[0])
+        return _get_file_dim(in_file)[0]
     except Exception as e:
         print(e)
 
@@ -727,14 +1576,20 @@ def get_row_num(in_file):
 @call_log
 def get_col_num(in_file, sep='\t'):
     """
-    获取文件列数（列数不一致时，以最后一行统计为准）
+    获取文件列数（列数不一致时，以最后一行统计为准，结果按文件缓存）
     :param in_file: 字符串，检查对象,例如："D:\a.txt"
-    :param sep: 字符串，分隔符，默认"\t"
+    :param sep: 字符串，分隔符，默认"\t"，" "表示以任意连续空白分隔（同awk）
     :return: 正常返回整数
     """
     try:
-        out = subprocess.getoutput("awk -F '%s' 'END{print NF}' %s" % (sep, in_file))
-        return int(out)
+        last_line = _get_file_dim(in_file)[1]
+        if not last_line:
+            return 0
+        if sep == " ":  # awk默认分隔：连续空格、制表符
+            return len(re.findall(rb"[^ \t\n]+", last_line))
+        if len(sep) == 1:
+            return last_line.count(sep.encode("UTF-8")) + 1
+        return len(re.split(sep, last_line.decode("UTF-8", errors="replace")))
     except Exception as e:
         print(e)
 
@@ -742,19 +1597,13 @@ def get_col_num(in_file, sep='\t'):
 @call_log
 def get_row_line(in_file, line_num=1):
     """
-    获取文件指定一行（整行作为字符串读入），默认读第一行
+    获取文件指定一行（整行作为字符串读入），默认读第一行，通过行偏移索引直接定位，无需从首行逐行读取
     :param in_file: 字符串，检查对象,例如："D:\a.txt"
     :param line_num: 正整数，指定读取行号，默认1
     :return: 正常返回指定行字符串，错误无返回
     """
     try:
-        for line, line_no in _read_line(in_file, rm_br=True):
-            if line_no < line_num:
-                continue
-            elif line_no > line_num:
-                return None
-            else:
-                return line
+        return _get_line_index(in_file).line(line_num)
     except Exception as e:
         print(e)
 
@@ -763,21 +1612,27 @@ get_row = get_line = get_row_line
 
 
 @call_log
-def file_line_dup(in_file, add_info=''):
+def file_line_dup(in_file, mem_lines: int = 2000000, add_info=''):
     """
-    数据重复行检查
+    数据重复行检查（以行内容定长摘要集合判重，不同行数超过mem_lines时改用外部排序）
     :param in_file: 字符串，检查对象,例如："D:\a.txt"
+    :param mem_lines: 正整数，内存中保存的行摘要数上限，超出后改用临时文件外部排序查重，None表示不限制，默认2000000
     :param add_info: 字符串，附加信息
     :return: 无重复返回0，有重复返回字符串报错信息
     """
     try:
-        res_list = []
+        seen = set()
         err = []
         for line, line_no in _read_line(in_file):
-            if line in res_list:
+            digest = _line_digest(line)
+            if digest in seen:
                 err.append(line_no)
             else:
-                res_list.append(line)
+                seen.add(digest)
+                if mem_lines is not None and len(seen) > mem_lines:
+                    seen = None
+                    err = _external_dup_line_nos(in_file)
+                    break
         if err:
             in_file_name = os.path.basename(in_file)
             return f'{add_info}{in_file_name}发现重复行，行号：{_join_str(err)}'
@@ -807,6 +1662,46 @@ def line_blank(in_line, add_info=''):
         return f"{add_info}检查空行时出错"
 
 
+@lru_cache(maxsize=32)
+def _sep_patterns(sep_r=r'\t'):
+    """
+    编译分隔符规范检查所用正则（按分隔符缓存，仅编译一次）
+    :param sep_r: 字符串，纯文本读入的分隔符，同line_sep
+    :return: 元组，（开头分隔符，连用分隔符，分隔符前空白，分隔符后空白，结尾空白，以上任一）正则编译对象
+    """
+    head_sep = re.compile(f"^[{sep_r}]")
+    sep_sep = re.compile(f"{sep_r}{sep_r}")
+    blank_sep = re.compile(rf"\s{sep_r}")
+    sep_blank = re.compile(rf"{sep_r}\s")
+    tail_blank = re.compile(r"\s$")
+    any_sep = re.compile("|".join(x.pattern for x in (head_sep, sep_sep, blank_sep, sep_blank, tail_blank)))
+    return head_sep, sep_sep, blank_sep, sep_blank, tail_blank, any_sep
+
+
+def _line_sep_msg(in_line, sep_r=r'\t'):
+    """
+    分隔符规范检查，返回问题描述（line_sep及file_line_sep共用）
+    :param in_line: 字符串，检查对象
+    :param sep_r: 字符串，纯文本读入的分隔符，同line_sep
+    :return: 规范返回""，不规范返回问题描述字符串
+    """
+    head_sep, sep_sep, blank_sep, sep_blank, tail_blank, any_sep = _sep_patterns(sep_r)
+    msg = ''
+    if not any_sep.search(in_line):  # 绝大多数行规范，一次匹配即可返回
+        return msg
+    if head_sep.search(in_line):
+        msg = msg + f"发现了以{sep_r}分隔符开头；"
+    if sep_sep.search(in_line):
+        msg = msg + f"发现了连续的{sep_r}分隔符；"
+    if blank_sep.search(in_line):
+        msg = msg + f"{sep_r}分隔符前发现了可疑空白；"
+    if sep_blank.search(in_line):
+        msg = msg + f"{sep_r}分隔符后发现了可疑空白；"
+    if tail_blank.search(in_line):
+        msg = msg + f"发现了空白结尾字符；"
+    return msg
+
+
 @call_log
 def line_sep(in_line, sep_r=r'\t', add_info=''):
     """
@@ -817,22 +1712,7 @@ def line_sep(in_line, sep_r=r'\t', add_info=''):
     :return: 规范返回0，不规范返回字符串报错信息
     """
     try:
-        head_sep = re.compile(f"^[{sep_r}]")
-        sep_sep = re.compile(f"{sep_r}{sep_r}")
-        blank_sep = re.compile(rf"\s{sep_r}")
-        sep_blank = re.compile(rf"{sep_r}\s")
-        tail_blank = re.compile(r"\s$")
-        msg = ''
-        if re.search(head_sep, in_line):
-            msg = msg + f"发现了以{sep_r}分隔符开头；"
-        if re.search(sep_sep, in_line):
-            msg = msg + f"发现了连续的{sep_r}分隔符；"
-        if re.search(blank_sep, in_line):
-            msg = msg + f"{sep_r}分隔符前发现了可疑空白；"
-        if re.search(sep_blank, in_line):
-            msg = msg + f"{sep_r}分隔符后发现了可疑空白；"
-        if re.search(tail_blank, in_line):
-            msg = msg + f"发现了空白结尾字符；"
+        msg = _line_sep_msg(in_line, sep_r=sep_r)
         if msg == "":
             return 0
         else:
@@ -842,11 +1722,35 @@ def line_sep(in_line, sep_r=r'\t', add_info=''):
         return f"{add_info}检查分隔符规范时出错"
 
 
+@call_log
+def file_line_sep(in_file, sep_r=r'\t', add_info=''):
+    """
+    文件逐行分隔符规范检查，一次流式读入文件（规则同line_sep）
+    :param in_file: 字符串，检查对象,例如："D:\a.txt"
+    :param sep_r: 字符串，纯文本读入的分隔符，含有与正则有关的字符应在字符串前加r,或将字符使用'\'转义,默认r'\t'
+    :param add_info: 字符串，附加信息
+    :return: 规范返回0，不规范返回报错信息列表（每个不规范行一条）
+    """
+    try:
+        error_list = []
+        for line, line_no in _read_line(in_file):
+            msg = _line_sep_msg(line, sep_r=sep_r)
+            if msg:
+                error_list.append(f'{add_info}第{line_no}行{msg}请检查')
+        if len(error_list) == 0:
+            return 0
+        else:
+            return error_list
+    except Exception as e:
+        print(e)
+        return [f"{add_info}检查文件分隔符规范时出错", ]
+
+
 @call_log
 def get_row2list(in_file, row_no=1, sep="\t",
                  rm_blank=True, fill_null=False, null_list: list = None):
     """
-    获取文件指定一行的元素列表，并默认移除元素前后空白，默认第一行
+    获取文件指定一行的元素列表，并默认移除元素前后空白，默认第一行（文件内容表已缓存时直接取用，否则按行偏移索引定位读取）
     :param in_file: 字符串，检查对象,例如："D:\a.txt"
     :param row_no: 正整数，指定读取行号，默认1
     :param sep: 字符串，指定行元素间分隔符，默认"\t"
@@ -856,54 +1760,49 @@ def get_row2list(in_file, row_no=1, sep="\t",
     :return: 正常返回指定行元素列表，错误无返回
     """
     try:
-        if isinstance(null_list, str):
-            null_list = [null_list, ]
-        if null_list is None:
-            null_list = ["", "NA", "N/A", "NULL"]
-        line_list = []
-        for line, line_no in _read_line(in_file):
-            if line_no < row_no:
-                continue
-            elif line_no > row_no:
-                break
-            else:
-                if rm_blank:
-                    line_list = list(map(lambda x: x.strip(), line.split(sep)))
-                if fill_null:
-                    line_list = ["NA" if x in null_list else x for x in line_list]
-                return line_list
+        table = _cached_table(in_file, sep=sep, rm_blank=rm_blank)
+        if table is not None:
+            return table.row2list(row_no=row_no, fill_null=fill_null, null_list=null_list)
+        line = _get_line_index(in_file).line(row_no)
+        if line is None:
+            return None
+        line_list = line.split(sep)
+        if rm_blank:
+            line_list = list(map(lambda x: x.strip(), line_list))
+        if fill_null:
+            line_list = _fill_null(line_list, null_list)
+        return line_list
     except Exception as e:
         print(e)
 
 
 @call_log
 def get_col2list(in_file, col_no=1, sep="\t",
-                 rm_blank=True, fill_null=True, null_list: list = None):
+                 rm_blank=True, fill_null=True, null_list: list = None, cache=True):
     """
-    获取文件指定一列的元素列表，并默认移除元素前后空白，默认第一列
+    获取文件指定一列的元素列表，并默认移除元素前后空白，默认第一列（文件内容表按文件缓存，同一文件仅切分一次）
     :param in_file: 字符串，检查对象,例如："D:\a.txt"
     :param col_no: 正整数，指定读取行号，默认1
     :param sep: 字符串，指定行元素间分隔符，默认"\t"
     :param rm_blank: 布尔值，是否移除该列元素前后空白，默认True
     :param fill_null: 布尔值，是否将缺失数据统一替换为NA，默认True
     :param null_list: 字符串/字符串列表，指定原数据表示缺失数据的符号，默认["", "NA", "N/A", "NULL"]
+    :param cache: 布尔值，是否构建并缓存文件内容表，默认True；False时已有缓存则直接取用，否则逐行读取只取该列，适用于大文件
     :return: 正常返回指定列元素列表，错误无返回
     """
     try:
-        if isinstance(null_list, str):
-            null_list = [null_list, ]
-        if null_list is None:
-            null_list = ["", "NA", "N/A", "NULL"]
-        col_elements = []
-        for row, no in _read_line(in_file):
-            row_list = row.split(sep)
-            if rm_blank:
-                row_list = list(map(lambda x: x.strip(), row_list))
-            if fill_null:
-                row_list = ["NA" if x in null_list else x for x in row_list]
-            col_element = row_list[col_no - 1]
-            col_elements.append(col_element)
-        return col_elements
+        if cache:
+            table = _get_table(in_file, sep=sep, rm_blank=rm_blank)
+        else:
+            table = _cached_table(in_file, sep=sep, rm_blank=rm_blank)
+        if table is not None:
+            return table.col2list(col_no=col_no, fill_null=fill_null, null_list=null_list)
+        col_list = [line.split(sep)[col_no - 1] for line, line_no in _read_line(in_file)]  # 列号非正时同列表负下标
+        if rm_blank:
+            col_list = [x.strip() for x in col_list]
+        if fill_null:
+            col_list = _fill_null(col_list, null_list)
+        return col_list
     except Exception as e:
         print(e)
 
@@ -955,20 +1854,78 @@ def list_range(in_list, min_len=0, max_len: int = float('inf'), key='元素', ad
     return list_length(in_list=in_list, min_len=min_len, max_len=max_len, key=key, add_info=add_info)
 
 
+_NA_LIST = ("", "NA", "N/A", "NULL")
+
+
+def _str_set(values, default=()):
+    """
+    将禁用/缺失元素转为字符串集合，已是frozenset时原样返回，便于调用前预先生成、多次复用
+    :param values: 字符串/字符串列表/frozenset，None表示使用default
+    :param default: 元组，values为None时的默认元素
+    :return: frozenset
+    """
+    if values is None:
+        values = default
+    if isinstance(values, frozenset):
+        return values
+    if isinstance(values, str):
+        values = [values, ]
+    return frozenset(map(str, values))
+
+
+def _str_items(in_list, strip=False):
+    """
+    将检查对象统一为字符串元素：列表/元组返回列表，numpy数组/pandas对象返回object类型Series；已全为字符串时不再逐个转换
+    :param in_list: 列表/元组/numpy数组/Series，检查对象
+    :param strip: 布尔值，是否去除元素前后空白，默认False
+    :return: 字符串列表或Series
+    """
+    if isinstance(in_list, (np.ndarray, pd.Series, pd.Index)):
+        items = pd.Series(np.asarray(in_list, dtype=object))
+        if pd.api.types.infer_dtype(items, skipna=False) != "string":
+            items = items.map(str)
+        return items.str.strip() if strip else items
+    items = in_list if isinstance(in_list, list) else list(in_list)
+    if set(map(type, items)) - {str}:
+        items = list(map(str, items))
+    return list(map(str.strip, items)) if strip else items
+
+
+def _first_order(found, items):
+    """
+    按首次出现顺序排列已找到的元素，至多遍历一次且全部定位后即停止（不对每个元素重新扫描列表）
+    :param found: 集合，已找到的元素
+    :param items: 列表，原始元素
+    :return: 列表，found中元素按在items中首次出现的顺序排列
+    """
+    order = {}
+    if found:
+        for item in items:
+            if item in found and item not in order:
+                order[item] = None
+                if len(order) == len(found):
+                    break
+    return list(order)
+
+
 @call_log
-def list_dup(in_list, key='元素', add_info=""):
+def list_dup(in_list, key='元素', strip=True, add_info=""):
     """
     检查列表中的重复元素
-    :param in_list: 列表，检查对象
+    :param in_list: 列表/numpy数组/Series，检查对象
     :param key: 字符串，关键字
+    :param strip: 布尔值，是否先去除元素前后空白再判重，默认True；元素已去空白（如rm_blank读入）时可设False
     :param add_info: 字符串，附加信息
     :return: 无重复0，有重复返回字符串报错信息
     """
     try:
-        in_list = list(map(lambda x: str(x), in_list))
-        in_list = list(map(lambda x: x.strip(), in_list))
-        list_count = dict(Counter(in_list))
-        dup_item = [key for key, value in list_count.items() if value > 1]
+        items = _str_items(in_list, strip=strip)
+        if isinstance(items, pd.Series):
+            dup_item = items[items.duplicated(keep=False)].unique().tolist()
+        elif len(set(items)) == len(items):  # 无重复时只建一次集合
+            dup_item = []
+        else:
+            dup_item = [key for key, value in Counter(items).items() if value > 1]
         if not dup_item:
             return 0
         else:
@@ -982,20 +1939,23 @@ def list_dup(in_list, key='元素', add_info=""):
 def list_ban(in_list, ban_list: list = None, key='元素', add_info=""):
     """
     检查列表中的禁用元素
-    :param in_list: 列表，检查对象
-    :param ban_list: 字符串/字符串列表，禁用元素，默认[]，即无禁用
+    :param in_list: 列表/numpy数组/Series，检查对象
+    :param ban_list: 字符串/字符串列表/frozenset，禁用元素，默认[]，即无禁用；多次检查时可传入预先生成的frozenset
     :param key: 字符串，关键字
     :param add_info: 字符串，附加信息
-    :return: 无禁用返回0，有禁用返回字符串报错信息
+    :return: 无禁用返回0，有禁用返回字符串报错信息（禁用元素按首次出现顺序列出）
     """
     try:
-        if isinstance(ban_list, str):
-            ban_list = [ban_list, ]
-        if ban_list is None:
-            ban_list = []
-        in_list = list(map(lambda x: str(x), in_list))
-        ban_list = list(map(lambda x: str(x), ban_list))
-        ban_item = set(in_list).intersection(set(ban_list))
+        ban_set = _str_set(ban_list)
+        if not ban_set:
+            return 0
+        items = _str_items(in_list)
+        if isinstance(items, pd.Series):
+            ban_item = items[items.isin(ban_set)].unique().tolist()
+        else:
+            ban_item = ban_set.intersection(items)
+            if ban_item:
+                ban_item = _first_order(ban_item, items)
         if ban_item:
             return f"{add_info}{key}{_join_str(ban_item)}，请检查"
         else:
@@ -1010,18 +1970,14 @@ def list_na(in_list, na_list: list = None, key='元素', add_info=""):
     """
     检查列表中是否包含缺失数据
     :param in_list: 列表，检查对象
-    :param na_list: 字符串/字符串列表，定义为缺失数据的字符类型列表，默认("", "NA", "N/A", "NULL")
+    :param na_list: 字符串/字符串列表/frozenset，定义为缺失数据的字符类型列表，默认("", "NA", "N/A", "NULL")
     :param key: 字符串，关键字
     :param add_info: 字符串，附加信息
     :return: 无缺失返回0，有缺失返回字符串报错信息
     """
     try:
-        if isinstance(na_list, str):
-            na_list = [na_list, ]
-        if na_list is None:
-            na_list = ["", "NA", "N/A", "NULL"]
         add_info = add_info + '含有空或缺失'
-        return list_ban(in_list=in_list, ban_list=na_list, key=key, add_info=add_info)
+        return list_ban(in_list=in_list, ban_list=_str_set(na_list, _NA_LIST), key=key, add_info=add_info)
     except Exception as e:
         print(e)
         return f"{add_info}检查缺失时出错"
@@ -1045,22 +2001,12 @@ def list_format(in_list, re_obj=None, re_ban_body=None, ck_head=True, re_ban_hea
     :return: 范围内返回0，范围外返回字符串报错信息
     """
     try:
+        in_list = list(in_list)
         if rm_first:
             in_list = in_list[1:]
-        if re_obj is None:
-            re_obj = re.compile(r'^[A-Za-z0-9]([A-Za-z0-9._-])*$')
-            if re_ban_body is None:
-                re_ban_body = re.compile(r"[^A-Za-z0-9._-]")
-            if ck_head and re_ban_head is None:
-                re_ban_head = re.compile(r"^[^A-Za-z0-9]")
-            if ck_tail and re_ban_tail is None:
-                re_ban_tail = re.compile(r"[^A-Za-z0-9]$")
-        error_item = []
-        for i in in_list:
-            err_msg = str_format(in_str=i, re_obj=re_obj, re_ban_body=re_ban_body,
-                                 ck_head=ck_head, re_ban_head=re_ban_head, re_ban_tail=re_ban_tail)
-            if err_msg:
-                error_item.append(i)
+        re_obj = _format_patterns(re_obj, re_ban_body, ck_head, re_ban_head, ck_tail, re_ban_tail, _LIST_FORMAT)[0]
+        # 整列一次匹配，仅不合规元素进入报错（报错只列元素，无需逐个诊断非法字符）
+        error_item = [in_list[i] for i in np.flatnonzero(~_format_mask(in_list, re_obj))]
         if error_item:
             return f"{add_info}检查到不合规{key}{_join_str(error_item)}"
         else:
@@ -1101,28 +2047,304 @@ def list_factor(in_list, exp_num=None, min_num=1, max_num: int = float('inf'),
 list_factor_num = list_class_num = list_group_num = list_factor
 
 
+_TYPE_FUNCS = {"float": float, "int": int, "str": str, "bool": bool, "complex": complex}
+
+
+def _is_type(value, type_func):
+    """判断单个元素能否转换为期望类型"""
+    try:
+        type_func(value)
+    except (ValueError, TypeError, OverflowError):
+        return False
+    return True
+
+
+def _float_array(in_list):
+    """
+    向量化将元素列表转换为float64数组：object数组整体转换，由numpy循环逐元素调用float的C实现，结果及可接受的写法与float完全一致，
+    且比先转为numpy字符串数组再解析更快；存在无法转换的元素时抛出ValueError/TypeError
+    :param in_list: 列表/数组，转换对象
+    :return: float64数组
+    """
+    in_array = np.asarray(in_list, dtype=object)
+    if in_array.ndim != 1:  # 同float逐个转换，非序列对象不可转换
+        raise TypeError(f"'{type(in_list).__name__}' object is not a 1-D sequence")
+    return in_array.astype(np.float64)
+
+
+def _bad_type_pos(in_list, type_func):
+    """
+    定位列表中无法转换为期望类型的元素
+    :param in_list: 列表，检查对象
+    :param type_func: 类型转换函数，如float
+    :return: 无法转换元素的下标列表（从0开始）
+    """
+    if type_func is float:  # 向量化转换，仅对转换为缺失值的候选元素逐个复核（"nan"等可被float接受）
+        num = pd.to_numeric(pd.Series(in_list, dtype=object), errors="coerce")
+        candidates = np.flatnonzero(num.isna().to_numpy())
+        bad_pos = [i for i in candidates.tolist() if not _is_type(in_list[i], float)]
+        try:  # 向量化复核其余元素，保证与float结果一致
+            _float_array(np.delete(np.asarray(in_list, dtype=object), bad_pos))
+            return bad_pos
+        except (ValueError, TypeError, OverflowError):
+            pass  # pandas判为数值但float不接受的元素，逐个检查全部元素
+    return [i for i, x in enumerate(in_list) if not _is_type(x, type_func)]
+
+
+def _type_msg(bad_value, bad_pos, exp_type='float', add_info=""):
+    """由非期望类型元素及其位置（从1开始）生成类型报错信息，重复元素只列出一次"""
+    bad_value = list(OrderedDict.fromkeys(bad_value))
+    return f"{add_info}检查到非{exp_type}类值：{_join_str(bad_value)}，位于第{_join_str(bad_pos)}个元素"
+
+
+def _list_type(in_list, exp_type='float', rm_first=False, add_info=""):
+    """同list_type，但期望类型为float时正常返回float64数组（不再逐个生成float对象），供批量检查直接使用"""
+    try:
+        if rm_first:
+            in_list = in_list[1:]
+        type_func = _TYPE_FUNCS.get(str(exp_type).lower())
+        if type_func is None:
+            return f"{add_info}期望类型{exp_type}不被支持，只允许使用{_join_str(_TYPE_FUNCS)}"
+        try:
+            if type_func is float:  # 整列向量化转换，失败时才定位非期望类型元素
+                return _float_array(in_list)
+            return list(map(type_func, in_list))
+        except (ValueError, TypeError, OverflowError):
+            bad_pos = _bad_type_pos(in_list, type_func)
+            if not bad_pos:
+                raise
+        return _type_msg([in_list[i] for i in bad_pos], [i + 1 for i in bad_pos], exp_type=exp_type, add_info=add_info)
+    except Exception as e:
+        print(e)
+        return f"{add_info}检查类型时出错"
+
+
 @call_log
 def list_type(in_list, exp_type='float', rm_first=False, add_info=""):
     """
     检查列表元素类型，并转换期望元素类型的新列表
     :param in_list: 列表，检查对象
-    :param exp_type: 字符串，期望列表元素类型，限定为python支持的格式,如[int,float,str,bool,...]，默认"float"
+    :param exp_type: 字符串，期望列表元素类型，限定为float、int、str、bool、complex，默认"float"
     :param rm_first: 布尔值，默认False,是否去掉首个元素，当文件有标题行时选True
     :param add_info: 字符串，附加信息
-    :return: 正常返回新列表，异常返回字符串报错信息
+    :return: 正常返回新列表，异常返回字符串报错信息（包含全部非期望类型元素及其位置）
+    """
+    result = _list_type(in_list, exp_type=exp_type, rm_first=rm_first, add_info=add_info)
+    return result.tolist() if isinstance(result, np.ndarray) else result
+
+
+def _ban_num_list(ban_num):
+    """禁用数值统一为列表，None表示无禁用"""
+    if ban_num is None:
+        return []
+    if isinstance(ban_num, (list, tuple, set)):
+        return list(ban_num)
+    return [ban_num, ]
+
+
+@call_log
+def num_range_mask(in_array, min_num=float('-inf'), max_num=float('inf')):
+    """
+    数值数组（可为二维块）范围检查，一次计算越界掩码
+    :param in_array: 数值数组/列表，检查对象
+    :param min_num: 浮点数，数值下限，默认负无穷
+    :param max_num: 浮点数，数值上限，默认正无穷
+    :return: 与in_array形状相同的布尔数组，True表示超出界限（含NaN）
+    """
+    in_array = np.asarray(in_array)
+    with np.errstate(invalid='ignore'):  # NaN参与比较视为越界，不提示警告
+        return ~((in_array >= min_num) & (in_array <= max_num)).astype(bool)
+
+
+@call_log
+def num_ban_mask(in_array, ban_num: list = None):
+    """
+    数值数组（可为二维块）禁用值检查，一次计算禁用掩码
+    :param in_array: 数值数组/列表，检查对象
+    :param ban_num: 数值/数值列表，禁用数值，None表示无禁用限制
+    :return: 与in_array形状相同的布尔数组，True表示为禁用值
+    """
+    in_array = np.asarray(in_array)
+    mask = np.zeros(in_array.shape, dtype=bool)
+    for num in _ban_num_list(ban_num):
+        if isinstance(num, (int, float, np.number)):  # 非数值禁用值不可能与数值相等
+            mask |= (in_array == num)
+    return mask
+
+
+@call_log
+def get_const_mask(in_array, axis=1, skip_na=False):
+    """
+    识别数值二维块中的常量行/列（方差为0），以最小值等于最大值且为有限值判断，一次完成
+    :param in_array: 数值二维数组/DataFrame，一维数组视为单行
+    :param axis: 整数，1表示按行（每行一个结果），0表示按列，None表示同时返回(行结果, 列结果)，默认1
+    :param skip_na: 布尔值，是否忽略缺失值（NaN），同pandas var默认行为；False时含缺失值的行/列不视为常量，默认False
+    :return: 布尔数组，True表示该行/列为常量
+    """
+    in_array = np.asarray(in_array, dtype=float)
+    if in_array.ndim == 1:
+        in_array = in_array[np.newaxis, :]
+    if axis is None:
+        return get_const_mask(in_array, axis=1, skip_na=skip_na), get_const_mask(in_array, axis=0, skip_na=skip_na)
+    if in_array.shape[axis] == 0:
+        return np.zeros(in_array.shape[1 - axis], dtype=bool)
+    if skip_na:
+        na_mask = np.isnan(in_array)
+        min_array = np.where(na_mask, np.inf, in_array).min(axis=axis)
+        max_array = np.where(na_mask, -np.inf, in_array).max(axis=axis)
+    else:
+        min_array = in_array.min(axis=axis)
+        max_array = in_array.max(axis=axis)
+    return (min_array == max_array) & np.isfinite(min_array)
+
+
+def _chunk_const_rows(lines, sep="\t", usecols=None, dtype="float64"):
+    """
+    识别一块数据行中的常量行（方差为0），供file_var_filter串行或进程池调用
+    :param lines: 字符串列表，数据行（不含换行符及空白行）
+    :param sep: 字符串，分隔符
+    :param usecols: 列下标列表，参与计算的数值列（从0开始），None表示全部列
+    :param dtype: 字符串，数值精度，float64或float32
+    :return: 布尔数组，True表示该行为常量行
+    """
+    try:
+        block = pd.read_csv(io.StringIO("\n".join(lines)), sep=sep, header=None, usecols=usecols, dtype=dtype,
+                            quoting=csv.QUOTE_NONE, float_precision="round_trip", skip_blank_lines=False).to_numpy()
+    except ValueError:  # 含read_csv不接受而float可转换的写法（如"1_000"、全角数字），同类型检查逐元素按float转换
+        null_set = {"", "NA", "N/A", "NULL"}
+        rows = [line.split(sep) for line in lines]
+        cols = range(max(map(len, rows))) if usecols is None else usecols
+        cells = ["nan" if i >= len(row) or row[i] in null_set else row[i] for row in rows for i in cols]
+        block = _float_array(cells).reshape(len(rows), len(cols)).astype(dtype)
+    return get_const_mask(block, axis=1, skip_na=True)
+
+
+def _map_chunks(func, chunks, n_jobs=1, **kwargs):
+    """
+    按顺序对数据块执行函数，n_jobs大于1时提交进程池，在途数据块不超过进程数的2倍以限制内存占用
+    :param func: 函数，首个参数为数据块
+    :param chunks: 数据块可迭代对象
+    :param n_jobs: 整数，进程数，1表示串行
+    :return: 生成器（数据块, 函数结果），顺序同chunks
+    """
+    if n_jobs == 1:
+        for chunk in chunks:
+            yield chunk, func(chunk, **kwargs)
+        return
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, executor.submit(func, chunk, **kwargs)))
+            if len(pending) >= n_jobs * 2:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+
+@call_log
+def file_var_filter(in_file, out_file=None, sep="\t", header=True, index_col=True, chunk_size=50000,
+                    dtype="float64", n_jobs=1, const_mask=None, add_info=""):
+    """
+    按行分块流式删除数值完全一致（方差为0）的行，其余行原样写出，不整体读入文件；各块可交由进程池并行计算
+    常量行判断同get_const_mask（忽略缺失值，最小值等于最大值且为有限值）；已有常量行掩码时只按掩码原样写出保留行
+    :param in_file: 字符串，输入文件（UTF-8，如check_file_content检查后的文件）
+    :param out_file: 字符串，输出文件，None表示原地替换输入文件，写入临时文件后原子替换
+    :param sep: 字符串，分隔符，默认"\t"
+    :param header: 布尔值，首行是否为标题行（原样写出，不参与计算），默认True
+    :param index_col: 布尔值，首列是否为名称列（不参与计算），默认True
+    :param chunk_size: 正整数，每块行数，None同默认50000
+    :param dtype: 字符串，数值精度，float64（默认）或float32；float32内存减半，但float32精度下相等的数值视为一致
+    :param n_jobs: 整数，进程数，1表示串行，0或负数表示使用全部CPU，默认1
+    :param const_mask: 布尔数组，各数据行（不含标题行及空白行）是否为常量行，如由内存表计算；给出时不再计算方差，默认None
+    :param add_info: 字符串，附加信息
+    :return: 正常返回保留的数据行数（不含标题行），出错返回字符串报错信息
     """
     try:
-        if rm_first:
-            in_list = in_list[1:]
-        # flag = [isinstance(x, eval(exp_type)) for x in in_list]
-        # print(flag)
-        new_list = list(map(eval(exp_type.lower()), in_list))
-        return new_list
-    except ValueError as e:
-        return f"{add_info}检查到非{exp_type}类值：" + str(e).split(':')[-1]
+        if dtype not in ("float64", "float32"):
+            return f"{add_info}方差计算精度{dtype}不被支持，只允许使用float64或float32"
+        if not os.path.isfile(in_file):
+            return f"{add_info}按行方差过滤时出错，文件{in_file}不存在或非文件"
+        if n_jobs is None or n_jobs < 1:
+            n_jobs = os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = 50000
+        in_file = os.path.abspath(in_file)
+        out_file = in_file if out_file is None else os.path.abspath(out_file)
+        fd, tmp_file = tempfile.mkstemp(prefix=f".{os.path.basename(out_file)}.", dir=os.path.dirname(out_file))
+        try:
+            kept = 0
+            with os.fdopen(fd, "w", encoding="UTF-8", newline="\n") as fileOU, \
+                    open(in_file, "r", encoding="UTF-8") as fileIN:  # 临时文件描述符立即交由文件对象管理，出错时随之关闭
+                shutil.copymode(in_file, tmp_file)
+                lines = (x for x in (line.rstrip("\r\n") for line in fileIN) if x.strip())
+                first = next(lines, None)
+                if first is None:
+                    return f"{add_info}按行方差过滤时出错，文件{os.path.basename(in_file)}无内容"
+                col_num = len(first.split(sep))
+                if header:
+                    fileOU.write(first + "\n")
+                else:
+                    lines = itertools.chain([first], lines)
+                usecols = list(range(1, col_num)) if index_col else None
+
+                def chunks():
+                    chunk = []
+                    for line in lines:
+                        chunk.append(line)
+                        if len(chunk) >= chunk_size:
+                            yield chunk
+                            chunk = []
+                    if chunk:
+                        yield chunk
+
+                def given_masks():
+                    start = 0
+                    for chunk in chunks():
+                        chunk_mask = const_mask[start:start + len(chunk)]
+                        if len(chunk_mask) != len(chunk):
+                            raise ValueError(f"const_mask长度{len(const_mask)}少于数据行数")
+                        start += len(chunk)
+                        yield chunk, chunk_mask
+                    if start != len(const_mask):
+                        raise ValueError(f"const_mask长度{len(const_mask)}与数据行数{start}不一致")
+
+                if const_mask is not None:
+                    const_mask = np.asarray(const_mask, dtype=bool)
+                    masks = given_masks()
+                else:
+                    masks = _map_chunks(_chunk_const_rows, chunks(), n_jobs=n_jobs, sep=sep, usecols=usecols,
+                                        dtype=dtype)
+                for chunk, chunk_mask in masks:
+                    keep = [line for line, const in zip(chunk, chunk_mask) if not const]
+                    if keep:
+                        fileOU.write("\n".join(keep) + "\n")
+                    kept += len(keep)
+            os.replace(tmp_file, out_file)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+        return kept
     except Exception as e:
         print(e)
-        return f"{add_info}检查类型时出错"
+        return f"{add_info}按行方差过滤时出错"
+
+
+def _num_range_msg(err_list, min_num=float('-inf'), max_num=float('inf'), key='数值', add_info=""):
+    """由越界位置（从1开始）生成数值范围报错信息，无越界返回0"""
+    if not len(err_list):
+        return 0
+    min_num = '负无穷' if min_num == float('-inf') else min_num
+    max_num = '正无穷' if max_num == float('inf') else max_num
+    return f"{add_info}第{_join_str(err_list)}个{key}超出界限，上限为{min_num}，下限为{max_num}"
+
+
+def _num_ban_msg(err_list, ban_num: list = None, key='数值', add_info=""):
+    """由禁用值位置（从1开始）生成数值禁用报错信息，无禁用返回0"""
+    if not len(err_list):
+        return 0
+    return f"{add_info}第{_join_str(err_list)}个{key}为禁用值，禁用值为{_join_str(_ban_num_list(ban_num))}"
 
 
 @call_log
@@ -1140,17 +2362,8 @@ def list_num_range(in_list, min_num=float('-inf'), max_num=float('inf'), rm_firs
     try:
         if rm_first:
             in_list = in_list[1:]
-        err_list = []
-        for i in range(1, len(in_list) + 1):
-            msg = num_range(num=in_list[i - 1], min_num=min_num, max_num=max_num, add_info=f'第{i}个数值：')
-            if msg:
-                err_list.append(i)
-        if err_list:
-            min_num = '负无穷' if min_num == float('-inf') else min_num
-            max_num = '正无穷' if max_num == float('inf') else max_num
-            return f"{add_info}第{_join_str(err_list)}个{key}超出界限，上限为{min_num}，下限为{max_num}"
-        else:
-            return 0
+        err_list = (np.flatnonzero(num_range_mask(in_list, min_num=min_num, max_num=max_num)) + 1).tolist()
+        return _num_range_msg(err_list, min_num=min_num, max_num=max_num, key=key, add_info=add_info)
     except Exception as e:
         print(e)
         return f"{add_info}检查数值范围时出错"
@@ -1170,15 +2383,8 @@ def list_num_ban(in_list, ban_num: list = None, rm_first=False, key='数值', ad
     try:
         if rm_first:
             in_list = in_list[1:]
-        err_list = []
-        for i in range(1, len(in_list) + 1):
-            msg = num_ban(num=in_list[i-1], ban_num=ban_num, add_info="")
-            if msg:
-                err_list.append(i)
-        if err_list:
-            return f"{add_info}第{_join_str(err_list)}个{key}为禁用值，禁用值为{_join_str(ban_num)}"
-        else:
-            return 0
+        err_list = (np.flatnonzero(num_ban_mask(in_list, ban_num=ban_num)) + 1).tolist()
+        return _num_ban_msg(err_list, ban_num=ban_num, key=key, add_info=add_info)
     except Exception as e:
         print(e)
         return f"{add_info}检查数值禁用时出错"
@@ -1343,7 +2549,8 @@ def check_file_line_fix(in_file, sep="\t", rm_blank=True, fill_null=False, null_
 @call_log
 def pre_check_file_content(in_file, out_dir, new_file=None, sep='\t', encoding="utf-8", add_info=""):
     """
-    文件详细内容检查预处理，注注意new_file与in_file为同一文件时，处理后将会替换旧文件，已内置于check_file_content
+    文件详细内容检查预处理（一次流式读写：删除空白行，去除元素前后空白，短行以空元素补齐至首行列数），
+    处理结果先写入out_dir下临时文件再原子替换为new_file，注注意new_file与in_file为同一文件时，处理后将会替换旧文件，已内置于check_file_content
     :param in_file: 字符串，检查对象,例如："D:\a.txt"
     :param out_dir: 字符串，处理后对象输出目录，推荐os.path.join(args.outdir,"tmp/analysis")
     :param new_file: 字符串，处理后对象名，将保存到out_dir目录下,默认与原文件同名
@@ -1352,6 +2559,7 @@ def pre_check_file_content(in_file, out_dir, new_file=None, sep='\t', encoding="
     :param add_info: 字符串，附加信息
     :return: 正常返回0，异常返回字符串报错信息
     """
+    marks = _StepMarks("pre_check_file_content", os.path.basename(str(in_file)))
     try:
         if not os.path.isfile(in_file):
             return f"{add_info}文件详细内容检查预处理时出错，文件{in_file}不存在或非文件"
@@ -1364,31 +2572,397 @@ def pre_check_file_content(in_file, out_dir, new_file=None, sep='\t', encoding="
             new_file = os.path.join(os.path.abspath(out_dir), os.path.basename(new_file))
             # new_file = os.path.join(os.path.dirname(os.path.abspath(in_file)), os.path.basename(new_file))  # 同路径
             # new_file = os.path.abspath(new_file)  # 自定路径
-        if in_file == new_file:
-            cmd = f'sed -i "/^\s*$/d" {new_file}'  # 去空白行
-            print(cmd)
-            os.system(cmd)
-        else:
-            cmd = f'mkdir -p {out_dir} && cp {in_file} {new_file} && sed -i "/^\s*$/d" {new_file}'  # 去空白行
-            print(cmd)
-            os.system(cmd)
-        df = pd.read_csv(new_file, sep=sep, header=None, na_filter=False, encoding=encoding)
-        for i in range(df.shape[0]):  # 去元素前后空白
-            for j in range(df.shape[1]):
-                tem = str(df.iloc[i, j]).strip()
-                df.iloc[i, j] = tem
-        df.to_csv(new_file, sep=sep, index=0, header=None)
-    except pd.errors.ParserError as e:
-        print(e)
-        list1 = str(e).strip().split(' ')
-        return f"{add_info}[除空白行]首行包含{list1[-7]}列，而检测到第{list1[-3].strip(',')}行包含{list1[-1]}列，" \
-               f"所有行的列数不应超过首行，请检查：1.是否在首行两个元素间有且只有一个分隔符[{sep}]2.第{list1[-3].strip(',')}行" \
-               f"及后续行是否错误使用分隔符[{sep}]"
+        if not os.path.exists(os.path.dirname(new_file)):
+            os.makedirs(os.path.dirname(new_file))
+        fd, tmp_file = tempfile.mkstemp(prefix=f".{os.path.basename(new_file)}.", dir=os.path.dirname(new_file))
+        try:
+            col_num = None
+            line_no = 0
+            with os.fdopen(fd, "w", encoding=encoding, newline="\n") as fileOU, \
+                    open(in_file, "r", encoding=encoding) as fileIN:  # 临时文件描述符立即交由文件对象管理，出错时随之关闭
+                shutil.copymode(in_file, tmp_file)  # 同cp，保留原文件权限
+                for line in fileIN:
+                    line = line.rstrip("\n")
+                    if not line.strip(" \t\n\r\f\v"):
+                        continue  # 去空白行
+                    line_no += 1
+                    line_list = [x.strip() for x in line.split(sep)]  # 去元素前后空白
+                    if col_num is None:
+                        col_num = len(line_list)
+                    elif len(line_list) > col_num:
+                        return f"{add_info}[除空白行]首行包含{col_num}列，而检测到第{line_no}行包含{len(line_list)}列，" \
+                               f"所有行的列数不应超过首行，请检查：1.是否在首行两个元素间有且只有一个分隔符[{sep}]2.第{line_no}行" \
+                               f"及后续行是否错误使用分隔符[{sep}]"
+                    elif len(line_list) < col_num:
+                        line_list.extend([""] * (col_num - len(line_list)))
+                    fileOU.write(sep.join(line_list) + "\n")
+            if col_num is None:
+                print(f"{in_file}删除空白行后无内容")
+                return f"{add_info}文件详细内容检查预处理时出错"
+            os.replace(tmp_file, new_file)
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
     except Exception as e:
         print(e)
         return f"{add_info}文件详细内容检查预处理时出错"
     else:
         return 0
+    finally:
+        marks.done()
+
+
+def _check_lines_base(items, unit="列", prefix="", ck_length=True, length: int = None,
+                      ck_length_range=True, min_len=0, max_len: int = float('inf'),
+                      ck_dup=True, dup_strip=True, ck_ban=True, ban_list: list = None, ck_na=True,
+                      na_list: list = None):
+    """
+    行/列内容基础检查（长度、重复、禁用、缺失），供check_file_content串行或进程池分批调用
+    :param items: (行/列号, 元素列表或分块累计的_ColumnStat)的可迭代对象
+    :param unit: 字符串，"行"或"列"
+    :param prefix: 字符串，报错信息前缀
+    :param dup_strip: 布尔值，重复检查前是否去元素前后空白，元素已去空白时为False
+    :param ban_list: 字符串列表/frozenset，禁用元素，None表示不检查禁用
+    :param na_list: 字符串列表/frozenset，缺失数据符号
+    :return: 报错信息列表，按items顺序
+    """
+    error_list = []
+    if ban_list is not None:
+        ban_list = _str_set(ban_list)
+    na_list = _str_set(na_list, _NA_LIST)
+    for no, in_list in items:
+        len_list = dup_list = ban_items = na_items = in_list
+        if isinstance(in_list, _ColumnStat):  # 分块检查时的列累计结果
+            len_list, dup_list, ban_items, na_items = in_list.base_lists()
+        if ck_length and length is not None:
+            err_msg = list_length(in_list=len_list, exp_len=length)
+            if err_msg:
+                error_list.append(f"{prefix}第{no}{unit}{err_msg}")
+        elif not ck_length and ck_length_range:
+            err_msg = list_range(in_list=len_list, min_len=min_len, max_len=max_len)
+            if err_msg:
+                error_list.append(f"{prefix}第{no}{unit}{err_msg}")
+        if ck_dup:
+            err_msg = list_dup(in_list=dup_list, strip=dup_strip)
+            if err_msg:
+                error_list.append(f"{prefix}第{no}{unit}有重复：{err_msg}，该{unit}不允许重复值")
+        if ck_ban and ban_list is not None:
+            err_msg = list_ban(in_list=ban_items, ban_list=ban_list)
+            if err_msg:
+                error_list.append(f"{prefix}第{no}{unit}检查到非法元素{err_msg}")
+        if ck_na:
+            err_msg = list_na(in_list=na_items, na_list=na_list)
+            if err_msg:
+                error_list.append(f"{prefix}第{no}{unit}{err_msg}")
+    return error_list
+
+
+def _check_lines_type(items, unit="列", prefix="", exp_type='float', rm_first=False,
+                      ck_num_range=False, min_num=float('-inf'), max_num=float('inf'),
+                      ck_num_ban=True, ban_num: list = None, const_nos=None, cross_range=False):
+    """
+    行/列元素类型检查（含数值范围及禁用），供check_file_content串行或进程池分批调用
+    :param items: (行/列号, 元素列表)的可迭代对象
+    :param unit: 字符串，"行"或"列"
+    :param prefix: 字符串，报错信息前缀
+    :param const_nos: 集合，需识别常量（标准化检查）的行/列号，None表示不识别
+    :param cross_range: 布尔值，是否在类型转换的同时累计各数值列表同一位置元素的最小/最大值（忽略NaN），
+                        按列检查时即为各行的最小/最大值，用于识别常量行
+    :return: (报错信息列表, 通过数值类型检查的行/列数, 常量行/列号列表, (最小值数组, 最大值数组)或None)
+    """
+    error_list = []
+    flag = 0
+    type_list = [(no, _list_type(in_list=in_list, exp_type=exp_type, rm_first=rm_first)) for no, in_list in items]
+    num_lists = [msg for no, msg in type_list if not isinstance(msg, str)]
+    range_masks = _block_masks(num_range_mask, num_lists, min_num=min_num, max_num=max_num) if ck_num_range else None
+    ban_masks = _block_masks(num_ban_mask, num_lists, ban_num=ban_num) if ck_num_ban and ban_num is not None else None
+    k = 0
+    for no, msg in type_list:
+        if isinstance(msg, str):
+            error_list.append(f"{prefix}第{no}{unit}{msg}")
+            continue
+        if exp_type in ['float', 'int']:
+            flag += 1
+        if ck_num_range:
+            if range_masks is None:
+                err_msg = list_num_range(in_list=msg, min_num=min_num, max_num=max_num)
+            else:
+                err_msg = _num_range_msg((np.flatnonzero(range_masks[k]) + 1).tolist(), min_num=min_num, max_num=max_num)
+            if err_msg:
+                error_list.append(f"{prefix}第{no}{unit}{err_msg}")
+        if ck_num_ban and ban_num is not None:
+            if ban_masks is None:
+                err_msg = list_num_ban(in_list=msg, ban_num=ban_num)
+            else:
+                err_msg = _num_ban_msg((np.flatnonzero(ban_masks[k]) + 1).tolist(), ban_num=ban_num)
+            if err_msg:
+                error_list.append(f"{prefix}第{no}{unit}{err_msg}")
+        k += 1
+    const_list = []
+    if const_nos and exp_type in ['float', 'int']:
+        std_items = [(no, msg) for no, msg in type_list if not isinstance(msg, str) and no in const_nos]
+        const_masks = _block_masks(get_const_mask, [msg for no, msg in std_items])
+        if const_masks is not None:
+            const_list = [no for (no, msg), const in zip(std_items, const_masks) if const]
+    ranges = None
+    if cross_range and exp_type in ['float', 'int']:
+        try:
+            for msg in num_lists:
+                num_array = np.asarray(msg, dtype=float)
+                if ranges is None:
+                    ranges = (num_array, num_array)
+                else:
+                    ranges = (np.fmin(ranges[0], num_array), np.fmax(ranges[1], num_array))
+        except ValueError:  # 各列表长度不一致
+            ranges = None
+    return error_list, flag, const_list, ranges
+
+
+def _block_masks(mask_func, num_lists, **kwargs):
+    """
+    将等长数值列表堆叠为二维块，一次计算掩码
+    :param mask_func: 掩码函数，如num_range_mask
+    :param num_lists: 数值列表的列表
+    :return: 各列表对应的掩码（可按下标取用），无法按块计算时返回None（由调用方逐个检查）
+    """
+    try:
+        if not num_lists:
+            return []
+        if len(set(map(len, num_lists))) == 1:
+            return mask_func(np.array(num_lists), **kwargs)
+        return [mask_func(np.asarray(in_list), **kwargs) for in_list in num_lists]
+    except Exception:
+        return None
+
+
+class _ColumnStat(object):
+    """
+    分块检查时单列的累计结果，内存占用只与该列不重复元素及报错元素个数相关
+    """
+    __slots__ = ("length", "count", "ban_found", "na_found", "bad", "range_pos", "ban_pos", "min", "max", "values",
+                 "missing")
+
+    def __init__(self, keep_values=False):
+        """
+        :param keep_values: 布尔值，是否保留整列元素（列固定内容检查时使用），默认False
+        """
+        self.length = 0
+        self.count = Counter()  # 去前后空白后的元素计数，用于重复检查
+        self.ban_found = {}  # 按首次出现顺序记录的禁用/缺失元素（字典作有序集合）
+        self.na_found = {}
+        self.bad = []  # 非期望类型元素(位置, 元素)，位置从1开始
+        self.range_pos = []  # 数值越界位置，None表示无法检查
+        self.ban_pos = []  # 数值禁用位置，None表示无法检查
+        self.min = np.inf
+        self.max = -np.inf
+        self.values = [] if keep_values else None
+        self.missing = False  # 列号超出文件列数，结果同get_col2list返回None
+
+    def base_lists(self):
+        """
+        :return: 依次用于长度、重复、禁用、缺失检查的列表，检查结果与整列检查一致
+        """
+        dup_list = [x for x, n in self.count.items() for _ in range(min(n, 2))]
+        return range(self.length), dup_list, list(self.ban_found), list(self.na_found)
+
+
+def _read_chunks(in_file, sep="\t", rm_blank=True, fill_null=False, null_list: list = None, chunk_size=100000):
+    """
+    分块读取文件，元素切分方式与_load_table一致
+    :param in_file: 字符串，读取对象
+    :param chunk_size: 正整数，每块行数
+    :return: 生成器（行号列表, 各行元素列表）
+    """
+    line_nos = []
+    rows = []
+    for line, line_no in _read_line(in_file):
+        row_list = line.split(sep)
+        if rm_blank:
+            row_list = [x.strip() for x in row_list]
+        if fill_null:
+            row_list = _fill_null(row_list, null_list)
+        line_nos.append(line_no)
+        rows.append(row_list)
+        if len(rows) >= chunk_size:
+            yield line_nos, rows
+            line_nos = []
+            rows = []
+    if rows:
+        yield line_nos, rows
+
+
+def _check_chunks(in_file, sep="\t", rm_blank=True, fill_null=False, null_list: list = None, chunk_size=100000,
+                  row_base_list=None, row_base_kw=None, row_type_list=None, row_type_kw=None,
+                  col_base_list=None, col_base_kw=None, col_type_list=None, col_type_kw=None, col_fix_no=None):
+    """
+    分块流式完成行/列内容检查，供check_file_content分块模式调用；行检查逐块进行，列检查按列累计（重复计数、禁用/缺失元素、
+    类型错误及数值越界/禁用位置、最小/最大值），全部读完后按列号顺序生成与整列检查一致的报错信息
+    :param row_base_list: 行基础检查行号，None表示不检查，其余*_list同理
+    :param row_base_kw: 字典，传给_check_lines_base/_check_lines_type的检查参数，其余*_kw同理
+    :param col_fix_no: 正整数，需保留整列元素的列号（列固定内容检查），None表示不保留
+    :return: 字典，row_base/row_type/col_base/col_type为报错信息列表，row_flag/col_flag为通过数值类型检查的行/列数，
+             row_const/col_const为常量行/列号列表，col_fix为col_fix_no列元素列表
+    """
+    result = dict(row_base=[], row_type=[], row_flag=0, row_const=[],
+                  col_base=[], col_type=[], col_flag=0, col_const=[], col_fix=None)
+    row_base_set = set(row_base_list) if row_base_list is not None else set()
+    row_type_set = set(row_type_list) if row_type_list is not None else set()
+    col_base_set = set(col_base_list) if col_base_list is not None else set()
+    col_type_set = set(col_type_list) if col_type_list is not None else set()
+    stats = {no: _ColumnStat() for no in col_base_set | col_type_set}
+    if col_fix_no is not None:
+        stats.setdefault(col_fix_no, _ColumnStat()).values = []
+    ban_set = na_set = None
+    if col_base_set:
+        if col_base_kw["ck_ban"] and col_base_kw["ban_list"] is not None:
+            ban_set = _str_set(col_base_kw["ban_list"])
+        if col_base_kw["ck_na"]:
+            na_set = _str_set(col_base_kw["na_list"], _NA_LIST)
+    type_func = type_msg = None
+    if col_type_set:
+        exp_type = col_type_kw["exp_type"]
+        type_func = _TYPE_FUNCS.get(str(exp_type).lower())
+        if type_func is None:
+            type_msg = list_type([], exp_type=exp_type)
+        const_nos = col_type_kw["const_nos"] or set()
+    start = 0  # 本块首行在整列中的下标
+    seen_rows = set()
+    for line_nos, rows in _read_chunks(in_file, sep=sep, rm_blank=rm_blank, fill_null=fill_null,
+                                       null_list=null_list, chunk_size=chunk_size):
+        seen_rows.update(no for no in line_nos if no in row_base_set or no in row_type_set)
+        if row_base_set:
+            result["row_base"].extend(_check_lines_base(
+                [(no, row) for no, row in zip(line_nos, rows) if no in row_base_set], **row_base_kw))
+        if row_type_set:
+            msg_list, flag, const_list, _ = _check_lines_type(
+                [(no, row) for no, row in zip(line_nos, rows) if no in row_type_set], **row_type_kw)
+            result["row_type"].extend(msg_list)
+            result["row_flag"] += flag
+            result["row_const"].extend(const_list)
+        cols = list(zip(*rows)) if stats else []
+        for no, stat in stats.items():
+            if stat.missing or not 0 < no <= len(cols):
+                stat.missing = True
+                continue
+            col = cols[no - 1]
+            if stat.values is not None:
+                stat.values.extend(col)
+            if no in col_base_set:
+                if col_base_kw["ck_dup"]:
+                    stat.count.update(map(str.strip, col) if col_base_kw["dup_strip"] else col)
+                if ban_set:
+                    stat.ban_found.update(dict.fromkeys(_first_order(ban_set.intersection(col), col)))
+                if na_set:
+                    stat.na_found.update(dict.fromkeys(_first_order(na_set.intersection(col), col)))
+        num_stats = []
+        num_lists = []
+        if col_type_set and type_func is not None:
+            rm_first = col_type_kw["rm_first"] and start == 0
+            offset = start - 1 if col_type_kw["rm_first"] and start > 0 else start  # 本块首个元素在检查列表中的下标
+            for no in col_type_set:
+                stat = stats[no]
+                if stat.missing:
+                    continue
+                col = cols[no - 1][1:] if rm_first else cols[no - 1]
+                try:
+                    num_list = _float_array(col) if type_func is float else list(map(type_func, col))
+                except (ValueError, TypeError, OverflowError):
+                    stat.bad.extend((offset + i + 1, col[i]) for i in _bad_type_pos(col, type_func))
+                    continue
+                if not stat.bad:
+                    num_stats.append(stat)
+                    num_lists.append(num_list)
+        if num_lists:
+            if col_type_kw["ck_num_range"]:
+                masks = _block_masks(num_range_mask, num_lists,
+                                     min_num=col_type_kw["min_num"], max_num=col_type_kw["max_num"])
+                for k, stat in enumerate(num_stats):
+                    if masks is None or stat.range_pos is None:
+                        stat.range_pos = None
+                    else:
+                        stat.range_pos.extend((np.flatnonzero(masks[k]) + offset + 1).tolist())
+            if col_type_kw["ck_num_ban"] and col_type_kw["ban_num"] is not None:
+                masks = _block_masks(num_ban_mask, num_lists, ban_num=col_type_kw["ban_num"])
+                for k, stat in enumerate(num_stats):
+                    if masks is None or stat.ban_pos is None:
+                        stat.ban_pos = None
+                    else:
+                        stat.ban_pos.extend((np.flatnonzero(masks[k]) + offset + 1).tolist())
+            if const_nos and exp_type in ['float', 'int'] and len(num_lists[0]):
+                block = np.asarray(num_lists, dtype=float)
+                for stat, min_num, max_num in zip(num_stats, block.min(axis=1), block.max(axis=1)):
+                    stat.min = np.minimum(stat.min, min_num)  # NaN向后传递，与整列min/max一致
+                    stat.max = np.maximum(stat.max, max_num)
+        start += len(rows)
+    if row_base_set - seen_rows:  # 行号超出文件行数，结果同get_row2list返回None
+        result["row_base"].extend(_check_lines_base(
+            [(no, None) for no in row_base_list if no not in seen_rows], **row_base_kw))
+    if row_type_set - seen_rows:
+        msg_list, flag, const_list, _ = _check_lines_type(
+            [(no, None) for no in row_type_list if no not in seen_rows], **row_type_kw)
+        result["row_type"].extend(msg_list)
+    for stat in stats.values():
+        stat.length = start
+    if col_fix_no is not None and not stats[col_fix_no].missing:
+        result["col_fix"] = stats[col_fix_no].values
+    if col_base_list is not None:
+        result["col_base"] = _check_lines_base([(no, None if stats[no].missing else stats[no]) for no in col_base_list],
+                                               **col_base_kw)
+    if col_type_list is not None:
+        unit = col_type_kw["unit"]
+        prefix = col_type_kw["prefix"]
+        for no in col_type_list:
+            stat = stats[no]
+            if type_msg is not None or stat.bad or stat.missing:
+                if stat.missing:
+                    type_msg_no = list_type(None, exp_type=exp_type)
+                elif type_msg is None:
+                    type_msg_no = _type_msg([x[1] for x in stat.bad], [x[0] for x in stat.bad], exp_type=exp_type)
+                else:
+                    type_msg_no = type_msg
+                result["col_type"].append(f"{prefix}第{no}{unit}{type_msg_no}")
+                continue
+            if exp_type in ['float', 'int']:
+                result["col_flag"] += 1
+            if col_type_kw["ck_num_range"]:
+                if stat.range_pos is None:
+                    err_msg = "检查数值范围时出错"
+                else:
+                    err_msg = _num_range_msg(stat.range_pos, min_num=col_type_kw["min_num"],
+                                             max_num=col_type_kw["max_num"])
+                if err_msg:
+                    result["col_type"].append(f"{prefix}第{no}{unit}{err_msg}")
+            if col_type_kw["ck_num_ban"] and col_type_kw["ban_num"] is not None:
+                if stat.ban_pos is None:
+                    err_msg = "检查数值禁用时出错"
+                else:
+                    err_msg = _num_ban_msg(stat.ban_pos, ban_num=col_type_kw["ban_num"])
+                if err_msg:
+                    result["col_type"].append(f"{prefix}第{no}{unit}{err_msg}")
+            if no in const_nos and exp_type in ['float', 'int'] and stat.min == stat.max and np.isfinite(stat.min):
+                result["col_const"].append(no)
+    return result
+
+
+def _run_lines(func, nos, get_list, n_jobs=1, **kwargs):
+    """
+    对各行/列执行检查函数，n_jobs不为1时按行/列号顺序分批提交进程池，结果按原顺序返回；
+    批次在提交时才取元素列表，在途批次受_map_chunks限制，父进程不另存整表副本
+    :param func: 检查函数，首个参数为(行/列号, 元素列表)的可迭代对象
+    :param nos: 行/列号列表
+    :param get_list: 按行/列号获取元素列表的函数
+    :param n_jobs: 整数，进程数，1或None表示串行，0或负数表示使用全部CPU
+    :return: 各批次检查结果列表
+    """
+    nos = list(nos)
+    if n_jobs is not None and n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs is None or n_jobs == 1 or len(nos) < 2:
+        return [func(((no, get_list(no)) for no in nos), **kwargs)]
+    batch = -(-len(nos) // (n_jobs * 16))  # 每个进程约16批，平衡负载，在途批次约占全部的1/8
+    n_jobs = min(n_jobs, -(-len(nos) // batch))
+    batches = ([(no, get_list(no)) for no in nos[i:i + batch]] for i in range(0, len(nos), batch))
+    return [result for _, result in _map_chunks(func, batches, n_jobs=n_jobs, **kwargs)]
 
 
 @call_log
@@ -1421,7 +2995,7 @@ def check_file_content(in_file, out_dir, new_file=None,
                        ck_row_num_ban=True, ck_col_num_ban=True, ban_num: list = None,
                        ck_row_standard=False, ck_col_standard=False, ck_standard_list: list = None,
                        com_col_row_mum=True, row_greater: bool = None, contain_equal=True,
-                       add_info=''):
+                       one_pass=True, n_jobs=1, chunk_size: int = None, ret_const=False, add_info=''):
     """
     文件详细内容检查，注意new_file与in_file为同一文件时，处理后将会替换旧文件，后续检查及程序应使用new_file替代in_file传参
     :param in_file: 字符串，检查对象,例如："D:\a.txt"
@@ -1432,7 +3006,7 @@ def check_file_content(in_file, out_dir, new_file=None,
     :param fill_null: 布尔值，检查时是否将缺失数据统一替换为NA，默认True
     :param null_list: 字符串列表，检查时指定原数据表示缺失数据的符号，默认["", "NA", "N/A", "NULL"]
     :param ck_header: 布尔值，是否检查标题行，初查，比较首行个数是否少于尾行，该功能已内置于check_file_content_pre，默认False
-    :param ck_sep: 布尔值，是否检查分隔符规范，行数较多时，该步骤为耗时步骤，默认False
+    :param ck_sep: 布尔值，是否检查分隔符规范，一次流式读入逐行检查，默认False
     :param sep_r: 字符串，纯文本读入的分隔符，含有与正则有关的字符应在字符串前加r,或将字符使用'\'转义,默认r'\t'
     :param ck_line_dup: 布尔值，是否检查行重复，默认False
     :param ck_row_num: 布尔值，是否检查行数（或行数范围），以首列行数为准，默认True
@@ -1492,12 +3066,25 @@ def check_file_content(in_file, out_dir, new_file=None,
     :param com_col_row_mum: 布尔值，是否比较的行列数维度关系，默认False
     :param row_greater: 布尔值，是否行数更多，None表示不检查，忽视com_col_row_mum
     :param contain_equal: 布尔值，比较的行列数维度关系时，是否含等号，作为row_greater参数补充,默认为True
+    :param one_pass: 布尔值，是否一次读入文件后在内存中完成各项行/列检查，False表示每次检查均经get_row2list/get_col2list获取，默认True
+    :param n_jobs: 整数，行/列基础检查及类型检查使用的进程数，1表示串行，0或负数表示使用全部CPU，结果及报错顺序与串行一致，默认1
+    :param chunk_size: 正整数，分块流式检查每块行数，行检查逐块进行，列检查按列累计（重复计数、禁用/缺失元素、类型错误位置、最小/最大值等），
+                       内存占用与块大小及列累计结果相关，此时忽视one_pass及n_jobs，行检查报错按行号顺序输出，None表示不分块，默认None
+    :param ret_const: 布尔值，是否同时返回常量行掩码（布尔数组，各数据行在列类型检查的全部列上数值一致即方差为0，忽略NaN，
+                      rm_first为True时不含首行），在列类型检查转换数值时一并得出，判断同get_const_mask(skip_na=True)；
+                      仅不分块、列类型检查为数值且检查通过时返回，否则为None，默认False
     :param add_info: 字符串，附加信息
-    :return: 符合期望返回0，不符合返回报错信息列表
+    :return: 符合期望返回0，不符合返回报错信息列表；ret_const为True时返回(上述结果, 常量行掩码或None)
     """
+
+    def returns(result, const_mask=None):  # ret_const为True时附加返回常量行掩码
+        return (result, const_mask) if ret_const else result
+
+    marks = _StepMarks("check_file_content", os.path.basename(str(in_file)))
     try:
         if not os.path.isfile(in_file):
-            return [f"{add_info}检查文件详细内容时出错，文件{in_file}不存在或非文件", ]
+            error_list = [f"{add_info}检查文件详细内容时出错，文件{in_file}不存在或非文件", ]
+            return returns(error_list)
         error_list = []
         in_file_name = os.path.basename(in_file)
         if new_file is None:
@@ -1506,41 +3093,51 @@ def check_file_content(in_file, out_dir, new_file=None,
         else:
             new_file = os.path.join(os.path.abspath(out_dir), os.path.basename(new_file))
             # new_file = os.path.join(os.path.dirname(os.path.abspath(in_file)), os.path.basename(new_file))  # 同路径
+        marks.mark("pre_check")
         err_msg = pre_check_file_content(in_file=in_file, out_dir=out_dir, new_file=new_file, sep=sep, encoding='utf-8')
         if err_msg:
             error_list.append(f"{add_info}输入文件{in_file_name}{err_msg}")
-            return error_list
+            return returns(error_list)
         in_file = new_file  # 分隔符检查前，需确保使用去除空行及元素前后空白的新文件
+        marks.mark("load")
+        if one_pass and not chunk_size:  # 一次读入，后续行/列元素列表均从内存表中获取
+            table = _get_table(in_file, sep=sep, rm_blank=rm_blank)
+            row2list = partial(table.row2list, fill_null=fill_null, null_list=null_list)
+            col2list = partial(table.col2list, fill_null=fill_null, null_list=null_list)
+        else:
+            row2list = partial(get_row2list, in_file=in_file, sep=sep, rm_blank=rm_blank,
+                               fill_null=fill_null, null_list=null_list)
+            col2list = partial(get_col2list, in_file=in_file, sep=sep, rm_blank=rm_blank,
+                               fill_null=fill_null, null_list=null_list)
         row_number = get_row_num(in_file=in_file)
         col_number = get_col_num(in_file=in_file, sep=sep)
         if ck_sep:
-            for row in range(1, row_number + 1):
-                in_line = get_row_line(in_file=in_file, line_num=row)
-                err_msg = line_sep(in_line, sep_r=sep_r)
-                if err_msg:
-                    error_list.append(f"{add_info}输入文件{in_file_name}第{row}行{err_msg}")
+            marks.mark("line_sep")
+            msg_list = file_line_sep(in_file=in_file, sep_r=sep_r)
+            if msg_list:
+                error_list.extend([f"{add_info}输入文件{in_file_name}{msg}" for msg in msg_list])
         if ck_header:
-            in_list = get_row2list(in_file=in_file, row_no=1, sep=sep, rm_blank=rm_blank,
-                                   fill_null=fill_null, null_list=null_list)
+            marks.mark("header")
+            in_list = row2list(row_no=1)
             tail_length = get_col_num(in_file=in_file, sep=sep)
             if len(in_list) < tail_length:
                 msg = f"{add_info}输入文件{in_file_name}的首行（标题行）部分为空，无法识别标题，请检查是否在两个行名间有且只有一个分隔符"
                 error_list.append(msg)
         if ck_line_dup:
+            marks.mark("line_dup")
             err_msg = file_line_dup(in_file=in_file)
             if err_msg:
                 error_list.append(f"{add_info}输入文件{in_file_name}{err_msg}")
         if error_list:  # 维度检查前需确保分隔符正确
-            return error_list
+            return returns(error_list)
+        marks.mark("dim")
         if ck_row_num and row_num_exp is not None:
-            in_list = get_col2list(in_file=in_file, col_no=1, sep=sep, rm_blank=rm_blank,
-                                   fill_null=fill_null, null_list=null_list)
+            in_list = range(row_number) if chunk_size else col2list(col_no=1)  # 分块时不读入整列，以行数计
             err_msg = list_length(in_list=in_list, exp_len=row_num_exp)
             if err_msg:
                 error_list.append(f"{add_info}输入文件{in_file_name}行数有误：{err_msg}")
         if ck_col_num and col_num_exp is not None:
-            in_list = get_row2list(in_file=in_file, row_no=1, sep=sep, rm_blank=rm_blank,
-                                   fill_null=fill_null, null_list=null_list)
+            in_list = row2list(row_no=1)
             err_msg = list_length(in_list=in_list, exp_len=col_num_exp)
             if err_msg:
                 error_list.append(f"{add_info}输入文件{in_file_name}列数有误：{err_msg}")
@@ -1549,8 +3146,7 @@ def check_file_content(in_file, out_dir, new_file=None,
                 row_min_num_exp = 1
             if row_max_num_exp is None:
                 row_max_num_exp = float('inf')
-            in_list = get_col2list(in_file=in_file, col_no=1, sep=sep, rm_blank=rm_blank,
-                                   fill_null=fill_null, null_list=null_list)
+            in_list = range(row_number) if chunk_size else col2list(col_no=1)  # 分块时不读入整列，以行数计
             err_msg = list_length(in_list=in_list, min_len=row_min_num_exp, max_len=row_max_num_exp)
             if err_msg:
                 error_list.append(f"{add_info}输入文件{in_file_name}行数范围有误：{err_msg}")
@@ -1559,13 +3155,13 @@ def check_file_content(in_file, out_dir, new_file=None,
                 col_min_num_exp = 1
             if col_max_num_exp is None:
                 col_max_num_exp = float('inf')
-            in_list = get_row2list(in_file=in_file, row_no=1, sep=sep, rm_blank=rm_blank,
-                                   fill_null=fill_null, null_list=null_list)
+            in_list = row2list(row_no=1)
             err_msg = list_length(in_list=in_list, min_len=col_min_num_exp, max_len=col_max_num_exp)
             if err_msg:
                 error_list.append(f"{add_info}输入文件{in_file_name}列数范围有误：{err_msg}")
         if error_list:  # 行列内容检查前需确保维度正确
-            return error_list
+            return returns(error_list)
+        prefix = f"{add_info}输入文件{in_file_name}"
         if ck_row_base:
             if ck_row_list == -1:
                 ck_row_list = range(2, row_number + 1)
@@ -1573,29 +3169,6 @@ def check_file_content(in_file, out_dir, new_file=None,
                 ck_row_list = range(1, row_number + 1)
             if isinstance(ck_row_list, int):
                 ck_row_list = [ck_row_list, ]
-            for row in ck_row_list:
-                in_list = get_row2list(in_file=in_file, row_no=row, sep=sep, rm_blank=rm_blank,
-                                       fill_null=fill_null, null_list=null_list)
-                if ck_row_length and row_length is not None:
-                    err_msg = list_length(in_list=in_list, exp_len=row_length)
-                    if err_msg:
-                        error_list.append(f"{add_info}输入文件{in_file_name}第{row}行{err_msg}")
-                elif not ck_row_length and ck_row_length_range:
-                    err_msg = list_range(in_list=in_list, min_len=row_min_len, max_len=row_max_len)
-                    if err_msg:
-                        error_list.append(f"{add_info}输入文件{in_file_name}第{row}行{err_msg}")
-                if ck_row_dup:
-                    err_msg = list_dup(in_list=in_list)
-                    if err_msg:
-                        error_list.append(f"{add_info}输入文件{in_file_name}第{row}行有重复：{err_msg}，该行不允许重复值")
-                if ck_row_ban and ban_list is not None:
-                    err_msg = list_ban(in_list=in_list, ban_list=ban_list)
-                    if err_msg:
-                        error_list.append(f"{add_info}输入文件{in_file_name}第{row}行检查到非法元素{err_msg}")
-                if ck_row_na:
-                    err_msg = list_na(in_list=in_list, na_list=na_list)
-                    if err_msg:
-                        error_list.append(f"{add_info}输入文件{in_file_name}第{row}行{err_msg}")
         if ck_col_base:
             if ck_col_list == -1:
                 ck_col_list = range(2, col_number + 1)
@@ -1603,32 +3176,86 @@ def check_file_content(in_file, out_dir, new_file=None,
                 ck_col_list = range(1, col_number + 1)
             if isinstance(ck_col_list, int):
                 ck_col_list = [ck_col_list, ]
-            for col in ck_col_list:
-                in_list = get_col2list(in_file=in_file, col_no=col, sep=sep, rm_blank=rm_blank,
-                                       fill_null=fill_null, null_list=null_list)
-                if ck_col_length and col_length is not None:
-                    err_msg = list_length(in_list=in_list, exp_len=col_length)
-                    if err_msg:
-                        error_list.append(f"{add_info}输入文件{in_file_name}第{col}列{err_msg}")
-                elif not ck_col_length and ck_col_length_range:
-                    err_msg = list_range(in_list=in_list, min_len=col_min_len, max_len=col_max_len)
-                    if err_msg:
-                        error_list.append(f"{add_info}输入文件{in_file_name}第{col}列{err_msg}")
-                if ck_col_dup:
-                    err_msg = list_dup(in_list=in_list)
-                    if err_msg:
-                        error_list.append(f"{add_info}输入文件{in_file_name}第{col}列有重复：{err_msg}，该列不允许重复值")
-                if ck_col_ban and ban_list is not None:
-                    err_msg = list_ban(in_list=in_list, ban_list=ban_list)
-                    if err_msg:
-                        error_list.append(f"{add_info}输入文件{in_file_name}第{col}列检查到非法元素{err_msg}")
-                if ck_col_na:
-                    err_msg = list_na(in_list=in_list, na_list=na_list)
-                    if err_msg:
-                        error_list.append(f"{add_info}输入文件{in_file_name}第{col}列{err_msg}")
+        row_std_set = None
+        if ck_row_standard:  # 标准化检查行/列号，行列分别解析
+            row_std_set = ck_standard_list
+            if row_std_set == -1:
+                row_std_set = range(2, row_number + 1)
+            elif row_std_set is None:
+                row_std_set = range(1, row_number + 1)
+            if isinstance(row_std_set, int):
+                row_std_set = [row_std_set, ]
+            row_std_set = set(row_std_set)
+        col_std_set = None
+        if ck_col_standard:
+            col_std_set = ck_standard_list
+            if col_std_set == -1:
+                col_std_set = range(2, col_number + 1)
+            elif col_std_set is None:
+                col_std_set = range(1, col_number + 1)
+            if isinstance(col_std_set, int):
+                col_std_set = [col_std_set, ]
+            col_std_set = set(col_std_set)
+        if ck_row_type:
+            if ck_row_type_list == -1:
+                ck_row_type_list = range(2, row_number + 1)
+            elif ck_row_type_list is None or ck_row_type_list == 0:
+                ck_row_type_list = range(1, row_number + 1)
+            if isinstance(ck_row_type_list, int):
+                ck_row_type_list = [ck_row_type_list, ]
+        if ck_col_type:
+            if ck_col_type_list == -1:
+                ck_col_type_list = range(2, col_number + 1)
+            elif ck_col_type_list is None or ck_col_type_list == 0:
+                ck_col_type_list = range(1, col_number + 1)
+            if isinstance(ck_col_type_list, int):
+                ck_col_type_list = [ck_col_type_list, ]
+        ban_set = _str_set(ban_list) if ban_list is not None else None  # 禁用及缺失元素集合只生成一次，各行/列共用
+        na_set = _str_set(na_list, _NA_LIST)
+        row_base_kw = dict(unit="行", prefix=prefix, ck_length=ck_row_length, length=row_length,
+                           ck_length_range=ck_row_length_range, min_len=row_min_len, max_len=row_max_len,
+                           ck_dup=ck_row_dup, dup_strip=not rm_blank, ck_ban=ck_row_ban, ban_list=ban_set,
+                           ck_na=ck_row_na, na_list=na_set)
+        col_base_kw = dict(unit="列", prefix=prefix, ck_length=ck_col_length, length=col_length,
+                           ck_length_range=ck_col_length_range, min_len=col_min_len, max_len=col_max_len,
+                           ck_dup=ck_col_dup, dup_strip=not rm_blank, ck_ban=ck_col_ban, ban_list=ban_set,
+                           ck_na=ck_col_na, na_list=na_set)
+        row_type_kw = dict(unit="行", prefix=prefix, exp_type=exp_type, rm_first=rm_first,
+                           ck_num_range=ck_row_num_range, min_num=row_min_num, max_num=row_max_num,
+                           ck_num_ban=ck_row_num_ban, ban_num=ban_num, const_nos=row_std_set)
+        col_type_kw = dict(unit="列", prefix=prefix, exp_type=exp_type, rm_first=rm_first,
+                           ck_num_range=ck_col_num_range, min_num=col_min_num, max_num=col_max_num,
+                           ck_num_ban=ck_col_num_ban, ban_num=ban_num, const_nos=col_std_set)
+        ck_col_fix = ck_col_fix and col_fix_content is not None
+        if chunk_size:  # 分块流式检查，行检查逐块进行，列检查按列累计
+            marks.mark("chunks")
+            chunk_result = _check_chunks(in_file, sep=sep, rm_blank=rm_blank, fill_null=fill_null, null_list=null_list,
+                                         chunk_size=chunk_size,
+                                         row_base_list=ck_row_list if ck_row_base else None, row_base_kw=row_base_kw,
+                                         row_type_list=ck_row_type_list if ck_row_type else None,
+                                         row_type_kw=row_type_kw,
+                                         col_base_list=ck_col_list if ck_col_base else None, col_base_kw=col_base_kw,
+                                         col_type_list=ck_col_type_list if ck_col_type else None,
+                                         col_type_kw=col_type_kw, col_fix_no=col_fix_no if ck_col_fix else None)
+        if ck_row_base:
+            marks.mark("row_base")
+            if chunk_size:
+                error_list.extend(chunk_result["row_base"])
+            else:
+                for msg_list in _run_lines(_check_lines_base, ck_row_list, lambda no: row2list(row_no=no),
+                                           n_jobs=n_jobs, **row_base_kw):
+                    error_list.extend(msg_list)
+        if ck_col_base:
+            marks.mark("col_base")
+            if chunk_size:
+                error_list.extend(chunk_result["col_base"])
+            else:
+                for msg_list in _run_lines(_check_lines_base, ck_col_list, lambda no: col2list(col_no=no),
+                                           n_jobs=n_jobs, **col_base_kw):
+                    error_list.extend(msg_list)
         if ck_row_fix and row_fix_content is not None:
-            in_list = get_row2list(in_file=in_file, row_no=row_fix_no, sep=sep, rm_blank=rm_blank,
-                                   fill_null=fill_null, null_list=null_list)
+            marks.mark("fix")
+            in_list = row2list(row_no=row_fix_no)
             if isinstance(row_fix_content, str):
                 row_fix_content = [row_fix_content, ]
             if in_list != list(row_fix_content):
@@ -1636,9 +3263,9 @@ def check_file_content(in_file, out_dir, new_file=None,
                 allowed_title = ",".join(list(row_fix_content))
                 err_msg = f"{add_info}输入文件{in_file_name}第{row_fix_no}行为{in_title}，该行必须为{allowed_title}，请检查"
                 error_list.append(err_msg)
-        if ck_col_fix and col_fix_content is not None:
-            in_list = get_col2list(in_file=in_file, col_no=col_fix_no, sep=sep, rm_blank=rm_blank,
-                                   fill_null=fill_null, null_list=null_list)
+        if ck_col_fix:
+            marks.mark("fix")
+            in_list = chunk_result["col_fix"] if chunk_size else col2list(col_no=col_fix_no)
             if isinstance(col_fix_content, str):
                 col_fix_content = [col_fix_content, ]
             if in_list != list(col_fix_content):
@@ -1647,97 +3274,66 @@ def check_file_content(in_file, out_dir, new_file=None,
                 err_msg = f"{add_info}输入文件{in_file_name}第{col_fix_no}列为{in_title}，该列必须为{allowed_title}，请检查"
                 error_list.append(err_msg)
         row_flag = []
+        row_const = []
         if ck_row_type:
-            if ck_row_type_list == -1:
-                ck_row_type_list = range(2, row_number + 1)
-            elif ck_row_type_list is None or ck_row_type_list == 0:
-                ck_row_type_list = range(1, row_number + 1)
-            if isinstance(ck_row_type_list, int):
-                ck_row_type_list = [ck_row_type_list, ]
-            for row in ck_row_type_list:
-                in_list = get_row2list(in_file=in_file, row_no=row, sep=sep, rm_blank=rm_blank,
-                                       fill_null=fill_null, null_list=null_list)
-                msg = list_type(in_list=in_list, exp_type=exp_type, rm_first=rm_first)
-                if isinstance(msg, str):
-                    error_list.append(f"{add_info}输入文件{in_file_name}第{row}行{msg}")
-                else:
-                    if exp_type in ['float', 'int']:
-                        row_flag.append(1)
-                    if ck_row_num_range:
-                        err_msg = list_num_range(in_list=msg, min_num=row_min_num, max_num=row_max_num)
-                        if err_msg:
-                            error_list.append(f"{add_info}输入文件{in_file_name}第{row}行{err_msg}")
-                    if ck_row_num_ban and ban_num is not None:
-                        err_msg = list_num_ban(in_list=msg, ban_num=ban_num)
-                        if err_msg:
-                            error_list.append(f"{add_info}输入文件{in_file_name}第{row}行{err_msg}")
+            marks.mark("row_type")
+            if chunk_size:
+                error_list.extend(chunk_result["row_type"])
+                row_flag.extend([1] * chunk_result["row_flag"])
+                row_const.extend(chunk_result["row_const"])
+            else:
+                for msg_list, flag, const_list, _ in _run_lines(_check_lines_type, ck_row_type_list,
+                                                             lambda no: row2list(row_no=no),
+                                                             n_jobs=n_jobs, **row_type_kw):
+                    error_list.extend(msg_list)
+                    row_flag.extend([1] * flag)
+                    row_const.extend(const_list)
         col_flag = []
+        col_const = []
+        col_ranges = None
         if ck_col_type:
-            if ck_col_type_list == -1:
-                ck_col_type_list = range(2, col_number + 1)
-            elif ck_col_type_list is None or ck_col_type_list == 0:
-                ck_col_type_list = range(1, col_number + 1)
-            if isinstance(ck_col_type_list, int):
-                ck_col_type_list = [ck_col_type_list, ]
-            for col in ck_col_type_list:
-                in_list = get_col2list(in_file=in_file, col_no=col, sep=sep, rm_blank=rm_blank,
-                                       fill_null=fill_null, null_list=null_list)
-                msg = list_type(in_list=in_list, exp_type=exp_type, rm_first=rm_first)
-                if isinstance(msg, str):
-                    error_list.append(f"{add_info}输入文件{in_file_name}第{col}列{msg}")
-                else:
-                    if exp_type in ['float', 'int']:
-                        col_flag.append(1)
-                    if ck_col_num_range:
-                        err_msg = list_num_range(in_list=msg, min_num=col_min_num, max_num=col_max_num)
-                        if err_msg:
-                            error_list.append(f"{add_info}输入文件{in_file_name}第{col}列{err_msg}")
-                    if ck_col_num_ban and ban_num is not None:
-                        err_msg = list_num_ban(in_list=msg, ban_num=ban_num)
-                        if err_msg:
-                            error_list.append(f"{add_info}输入文件{in_file_name}第{col}列{err_msg}")
-        if row_flag and ck_row_standard:
-            if ck_standard_list == -1:
-                ck_standard_list = range(2, row_number + 1)
-            elif ck_standard_list is None:
-                ck_standard_list = range(1, row_number + 1)
-            if isinstance(ck_standard_list, int):
-                ck_standard_list = [ck_standard_list, ]
-            if ck_standard_list in ck_row_type_list:
-                for row in ck_standard_list:
-                    in_list = get_row2list(in_file=in_file, row_no=row, sep=sep, rm_blank=rm_blank,
-                                           fill_null=fill_null, null_list=null_list)
-                    msg = list_factor(in_list=in_list, exp_num=1, rm_first=rm_first)
-                    if not msg:
-                        error_list.append(f"{add_info}输入文件{in_file_name}第{row}行数据完全一致，"
-                                          f"标准差为0，不能按行进行标准化，请删除该行或尝试按列标准化")
-        if col_flag and ck_col_standard:
-            if ck_standard_list == -1:
-                ck_standard_list = range(2, col_number + 1)
-            elif ck_standard_list is None:
-                ck_standard_list = range(1, col_number + 1)
-            if isinstance(ck_standard_list, int):
-                ck_standard_list = [ck_standard_list, ]
-            if ck_standard_list in ck_col_type_list:
-                for col in ck_standard_list:
-                    in_list = get_col2list(in_file=in_file, col_no=col, sep=sep, rm_blank=rm_blank,
-                                           fill_null=fill_null, null_list=null_list)
-                    msg = list_factor(in_list=in_list, exp_num=1, rm_first=rm_first)
-                    if not msg:
-                        error_list.append(f"{add_info}输入文件{in_file_name}第{col}列数据完全一致，"
-                                          f"标准差为0，不能按列进行标准化，请删除该列或尝试按行标准化")
+            marks.mark("col_type")
+            if chunk_size:
+                error_list.extend(chunk_result["col_type"])
+                col_flag.extend([1] * chunk_result["col_flag"])
+                col_const.extend(chunk_result["col_const"])
+            else:
+                for msg_list, flag, const_list, ranges in _run_lines(_check_lines_type, ck_col_type_list,
+                                                                     lambda no: col2list(col_no=no), n_jobs=n_jobs,
+                                                                     cross_range=ret_const, **col_type_kw):
+                    error_list.extend(msg_list)
+                    col_flag.extend([1] * flag)
+                    col_const.extend(const_list)
+                    if ranges is not None:  # 类型检查同时累计各行最小/最大值，常量行掩码无需再次计算
+                        col_ranges = ranges if col_ranges is None else \
+                            (np.fmin(col_ranges[0], ranges[0]), np.fmax(col_ranges[1], ranges[1]))
+        if row_flag and ck_row_standard:  # 仅检查已通过数值类型检查的目标行
+            for row in row_const:
+                error_list.append(f"{add_info}输入文件{in_file_name}第{row}行数据完全一致，"
+                                  f"标准差为0，不能按行进行标准化，请删除该行或尝试按列标准化")
+        if col_flag and ck_col_standard:  # 仅检查已通过数值类型检查的目标列
+            for col in col_const:
+                error_list.append(f"{add_info}输入文件{in_file_name}第{col}列数据完全一致，"
+                                  f"标准差为0，不能按列进行标准化，请删除该列或尝试按行标准化")
         if com_col_row_mum and row_greater is not None:
+            marks.mark("row_col_num")
             err_msg = file_com_row_col_num(in_file=in_file, sep=sep, row_greater=row_greater,
                                            contain_equal=contain_equal)
             if err_msg:
                 error_list.append(f"{add_info}输入文件{in_file_name}{err_msg}")
         if len(error_list) == 0:
-            return 0
+            const_mask = None
+            if ret_const and col_ranges is not None:
+                const_mask = (col_ranges[0] == col_ranges[1]) & np.isfinite(col_ranges[0])
+            return returns(0, const_mask)
         else:
-            return error_list
+            return returns(error_list)
     except Exception as e:
         print(e)
-        return [f"{add_info}检查文件详细内容时出错", ]
+        error_list = [f"{add_info}检查文件详细内容时出错", ]
+        return returns(error_list)
+    finally:
+        marks.done()
 
 
 @call_log
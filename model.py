@@ -12,6 +12,7 @@ import sys
 import re
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 
 # sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "bin"))
 # import check as c
@@ -24,6 +25,10 @@ import numpy as np
 from checkdir import check as c  # windows for me
 
 
+CHUNK_FILE_SIZE = 32 * 1024 * 1024  # 输入文件达到该大小时分块检查，并以流式按行方差过滤替代整表读入
+CHUNK_ROWS = 50000  # 分块检查及流式过滤的每块行数
+
+
 def basic_options():
     parser = argparse.ArgumentParser(usage="python3 %(prog)s",
                                      description="[ ]",
@@ -50,59 +55,73 @@ def basic_options():
     parser.add_argument('-float', '--float', required=False, dest="float",
                         help="[ ]. Optional, [default: %(default)s]",
                         type=float, nargs='?', default=0.01)
+    parser.add_argument('-profile', '--profile', required=False, dest="profile",
+                        help="Write per-step time and peak memory to tmp/cloud_error/profile.json. "
+                             "Optional, [default: %(default)s]",
+                        type=str, nargs='?', default="FALSE",
+                        choices=("FALSE", "TRUE"))
+    parser.add_argument('-threads', '--threads', required=False, dest="threads",
+                        help="Processes for the streaming variance filter of large infile, 0 means all CPUs. "
+                             "Optional, [default: %(default)s]",
+                        type=int, nargs='?', default=1)
 
     return parser
 
 
-def main(in_parser):
-    # ---- ---- ---- ---- ---- #
-    # pre check
-    global run_cmd
-    args, unparsed = in_parser.parse_known_args()
-    prefix = args.prefix
-    outDir = os.path.abspath(args.outdir)
-    infile = os.path.abspath(args.infile)
+def check_job(infile, groupfile, outdir="./", prefix="result", int_num=1000, chunk_size=None, n_jobs=1):
+    """
+    单个任务的检查流程：建立目录、写默认日志，检查参数、输入文件及分组文件，在tmp/tmp_data生成检查后的新文件
+    :param infile: 字符串，输入文件
+    :param groupfile: 字符串，分组文件
+    :param outdir: 字符串，任务输出目录，默认"./"
+    :param prefix: 字符串，输出文件前缀，默认"result"
+    :param int_num: 整数，[ ]，默认1000
+    :param chunk_size: 正整数，输入文件分块检查及流式方差过滤的每块行数，None表示文件达到CHUNK_FILE_SIZE时按CHUNK_ROWS分块
+    :param n_jobs: 整数，流式方差过滤的进程数，0或负数表示使用全部CPU，默认1（命令行-threads）
+    :return: (报错信息列表, 工作类型, 检查后输入文件, 检查后分组文件, 日志文件)
+    """
+    outDir = os.path.abspath(outdir)
+    infile = os.path.abspath(infile)
     newinfile = os.path.join(os.path.join(outDir, "tmp/tmp_data"), os.path.basename(infile))
-    groupfile = os.path.abspath(args.groupfile)
+    groupfile = os.path.abspath(groupfile)
     newgroupfile = os.path.join(os.path.join(outDir, "tmp/tmp_data"), os.path.basename(groupfile))
     c.make_cloud_dir(outDir, more_dir=['analysis', 'tmp_data'])
-    bin_path = os.path.dirname(os.path.abspath(__file__)) + "/bin"
-    ana_path = os.path.join(outDir, 'tmp/analysis')
     dat_path = os.path.join(outDir, 'tmp/tmp_data')
     log_file = f"{outDir}/tmp/cloud_error/error.txt"
     c.write_default_log(log_file)
-    perl = os.popen('which perl').read().rstrip('\n')
-    Rscript = os.popen('which Rscript').read().rstrip('\n')
-    python3 = os.popen('which python3').read().rstrip('\n')
-    # python = os.popen('which python').read().rstrip('\n')
     # ---- ---- ---- ---- ---- #
     # check
     err_log = []
     # check str
-    msg_list = c.check_str(args.prefix, add_info='输出文件前缀：')
+    msg_list = c.check_str(prefix, add_info='输出文件前缀：')
     if msg_list:
         err_log.extend(msg_list)
     # check num
-    msg_list = c.check_num(args.int, min_num=1000, max_num=10000000, add_info='[ ]：')
+    msg_list = c.check_num(int_num, min_num=1000, max_num=10000000, add_info='[ ]：')
     if msg_list:
         err_log.extend(msg_list)
     # check file
     # check infile
     err_plus = []
+    const_mask = None
     msg_list = c.check_file_base(in_file=infile, out_file=newinfile)
     if msg_list:
         err_plus.extend(msg_list)
     if len(err_plus) < 1:
+        if chunk_size is None and os.path.getsize(newinfile) >= CHUNK_FILE_SIZE:
+            chunk_size = CHUNK_ROWS
         # 删除所有空白行及元素前后空格，在out_dir生成检查后同名新文档；检查文件列数至少为5
         # 除第一列，检查所有列无缺失，为浮点数；（默认）检查第一行无重复缺失
-        msg_list = c.check_file_content(in_file=newinfile, out_dir=dat_path,
-                                        col_min_num_exp=5, ck_col_base=True, ck_col_dup=False, ck_col_list=-1,
-                                        ck_col_type=True, ck_col_type_list=-1, exp_type="float", rm_first=True,
-                                        add_info='输入文件：')
+        # 同时取回列类型检查转换数值时得出的常量行（表达量一致，方差为0）掩码，方差过滤不再重新解析文件或计算；分块检查时无掩码
+        msg_list, const_mask = c.check_file_content(in_file=newinfile, out_dir=dat_path,
+                                                    col_min_num_exp=5, ck_col_base=True, ck_col_dup=False,
+                                                    ck_col_list=-1, ck_col_type=True, ck_col_type_list=-1,
+                                                    exp_type="float", rm_first=True, chunk_size=chunk_size,
+                                                    ret_const=True, add_info='输入文件：')
         if msg_list:
             err_plus.extend(msg_list)
     if not err_plus:
-        col_list = c.get_col2list(in_file=newinfile, col_no=1)
+        col_list = c.get_col2list(in_file=newinfile, col_no=1, cache=False)  # 缺失名称记为NA；内容表已缓存时直接取用，否则只读该列
         add_info = "输入文件Index列"
         if col_list[0] != "Index":
             add_info = f"输入文件{col_list[1]}列"
@@ -115,11 +134,14 @@ def main(in_parser):
         if err_msg:  # 单独检查第一列字符串为数字、字母、点号（“.”）、下划线（“_”）和中划线（“-”）的组合，并且必须以字母或数字开头
             err_plus.append(err_msg)
         if not err_plus:
-            df = pd.read_csv(newinfile, sep="\t", header=0, index_col=0)
-            ndf = df[np.var(df, axis=1) != 0]
-            if ndf.shape[0] < 4:
-                err_plus.append(f"输入文件：代谢物数目错误，删除表达量一致的代谢物后剩余代谢物数为{ndf.shape[0]},不足4个")
-            ndf.to_csv(newinfile, sep="\t", index=True, header=True)
+            with c.profile_step("model.variance_filter", os.path.basename(newinfile)):
+                # 删除表达量一致（方差为0）的代谢物，保留行原样写出；有检查所得常量行掩码时按掩码过滤，否则分块流式计算
+                kept_num = c.file_var_filter(newinfile, chunk_size=chunk_size or CHUNK_ROWS, n_jobs=n_jobs,
+                                             const_mask=const_mask)
+                if isinstance(kept_num, str):
+                    err_plus.append(f"输入文件：{kept_num}")
+                elif kept_num < 4:
+                    err_plus.append(f"输入文件：代谢物数目错误，删除表达量一致的代谢物后剩余代谢物数为{kept_num},不足4个")
 
     # check groupfile
     err_plus2 = []
@@ -148,8 +170,9 @@ def main(in_parser):
         if err_msg:  # 单独检查第二列字符串为数字、字母、点号（“.”）、下划线（“_”）和中划线（“-”）的组合，并且必须以字母或数字开头
             err_plus2.append(err_msg)
     if not err_plus and not err_plus2:
-        err_msg = c.check_com_line(in_file1=newinfile, in_file2=newgroupfile, ck_1_row=True, ck_2_col=True,
-                                   rm_first=True, add_info="输入文件与分组文件样品名不匹配：")
+        with c.profile_step("check_com_line"):
+            err_msg = c.check_com_line(in_file1=newinfile, in_file2=newgroupfile, ck_1_row=True, ck_2_col=True,
+                                       rm_first=True, add_info="输入文件与分组文件样品名不匹配：")
         if err_msg:
             err_plus2.append(err_msg)
     condition = "[  ]"
@@ -161,11 +184,75 @@ def main(in_parser):
     else:
         err_plus.append("[ ]")
     err_log = err_log + err_plus + err_plus2
+    return err_log, work_type, newinfile, newgroupfile, log_file
+
+
+def _check_job(job):
+    """
+    check_batch进程池任务，有报错时写出该任务error.txt，同单任务流程
+    :param job: (infile, groupfile, params)元组，params为check_job其余参数的字典
+    :return: 报错信息列表，无报错为空列表
+    """
+    infile, groupfile, params = job
+    try:
+        err_log, work_type, newinfile, newgroupfile, log_file = check_job(infile, groupfile, **(params or {}))
+        if err_log:
+            c.write_log(log_list=err_log, log_file=log_file)
+        return err_log
+    except Exception as e:
+        print(e)
+        return [f"任务{os.path.basename(str(infile))}检查时出错"]
+    finally:
+        c.clear_file_cache()  # 进程池工作进程会复用，释放本任务缓存的内存表及行索引映射
+
+
+def check_batch(jobs, n_jobs=None):
+    """
+    批量检查多个任务，各任务的目录、error.txt及检查后文件与单任务流程一致
+    检查模块的文件缓存为进程内全局变量，且检查以纯Python计算为主，故使用进程池（各进程缓存独立，无需加锁，吞吐随核数增长）
+    :param jobs: (infile, groupfile, params)元组列表，params为字典，可含outdir、prefix、int_num、chunk_size、n_jobs，
+                 各任务outdir应互不相同
+    :param n_jobs: 整数，进程数，None表示CPU核数
+    :return: 各任务报错信息列表，顺序同jobs
+    """
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(_check_job, jobs))
+
+
+def _write_profile(log_file):
+    """开启性能记录时，在error.txt同目录写出profile.json"""
+    msg = c.write_profile(os.path.join(os.path.dirname(log_file), "profile.json"))
+    if msg:
+        print(msg)
+
+
+def main(in_parser):
+    # ---- ---- ---- ---- ---- #
+    # pre check
+    global run_cmd
+    args, unparsed = in_parser.parse_known_args()
+    prefix = args.prefix
+    outDir = os.path.abspath(args.outdir)
+    bin_path = os.path.dirname(os.path.abspath(__file__)) + "/bin"
+    ana_path = os.path.join(outDir, 'tmp/analysis')
+    profile = args.profile == "TRUE"
+    if profile:
+        c.start_profile()
+    with c.profile_step("model.check_job"):
+        err_log, work_type, newinfile, newgroupfile, log_file = check_job(args.infile, args.groupfile, outdir=outDir,
+                                                                          prefix=prefix, int_num=args.int,
+                                                                          n_jobs=args.threads)
+    perl = os.popen('which perl').read().rstrip('\n')
+    Rscript = os.popen('which Rscript').read().rstrip('\n')
+    python3 = os.popen('which python3').read().rstrip('\n')
+    # python = os.popen('which python').read().rstrip('\n')
     # ---- ---- ---- ---- ---- #
     # after check
     if err_log:
         print(err_log)
         c.write_log(log_list=err_log, log_file=log_file)
+        if profile:
+            _write_profile(log_file)
         sys.exit(1)
     # run proc
     a_path = os.path.dirname(os.path.abspath(__file__)) + "/a"
@@ -181,14 +268,16 @@ def main(in_parser):
               f"--outPrefix {prefix} --ell {args.ell} --scale {args.scale} --label {args.label} " \
               f"--height {args.height} --width {args.width}"
     print(run_cmd)
-    p1 = os.system(run_cmd)
+    with c.profile_step("model.run"):
+        p1 = os.system(run_cmd)
     if p1 == 0:
         msg_list = c.check_dir_item(ana_path,
                                     exp_item=["[ ]", "[ ]"])
         if msg_list:
             err_log.extend(msg_list)
         else:
-            msg_list = c.make_result(ana_path, out_dir=outDir, exp_item=["[ ]", "[ ]"])
+            with c.profile_step("make_result"):
+                msg_list = c.make_result(ana_path, out_dir=outDir, exp_item=["[ ]", "[ ]"])
             if msg_list:
                 err_log.extend(msg_list)
         pass
@@ -197,11 +286,15 @@ def main(in_parser):
     if len(err_log) > 0:
         print(err_log)
         c.write_log(log_list=err_log, log_file=log_file)
+        if profile:
+            _write_profile(log_file)
         sys.exit(1)
     else:
         c.del_all(os.path.dirname(log_file))
         c.del_all(os.path.join(outDir, 'tmp/analysis'), self_contain=True)
         c.del_all(os.path.join(outDir, 'tmp/tmp_data'), self_contain=True)
+        if profile:  # 清空tmp/cloud_error后再写出，成功任务同样保留性能记录
+            _write_profile(log_file)
         print('此次任务顺利运行结束！\n')
 
 